@@ -0,0 +1,31 @@
+class BackendBase:
+    """What SupabaseClient and LocalStore share on top of their own
+    get_or_create_player, get_score, update and phrases (a PhraseCache)."""
+
+    BOT_NAME = "Bot"
+    ALLOWED_CATEGORIES = ("cowboy", "cowboys", "pixar", "social")
+
+    _bot_playerid = None
+
+    # player
+    def get_bot_playerid(self):
+        if self._bot_playerid is None:
+            self._bot_playerid = self.get_or_create_player(self.BOT_NAME)
+        return self._bot_playerid
+
+    # phrase
+    def _categories(self, exclude):
+        excluded = {c.strip().lower() for c in exclude or ()}
+        return [c for c in self.ALLOWED_CATEGORIES if c not in excluded]
+
+    def phrase_index(self, difficulty="medium", exclude=("music",)):
+        """Hard+ candidate index over the pool get_random_phrase draws from;
+        None until the background build first finishes."""
+        return self.phrases.phrase_index(difficulty, self._categories(exclude))
+
+    # score
+    def reconcile_score(self, gameid, playerid, expected):
+        actual = self.get_score(gameid, playerid)
+        if actual != expected:
+            self.update("gameplayers", {"score": expected}, {"gameid": gameid, "playerid": playerid})
+        return actual
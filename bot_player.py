@@ -1,72 +1,262 @@
+import functools
+import math
 import random
-import string
+
+from letter_mask import ALPHABET, BIT, letters_of, mask_of
 
 
 class BotPlayer:
     # letter frequency (most to least common letters)
     FREQ_ORDER = list("ETAOINSHRDLCUMWFGYPBVKJXQZ")
 
-    def __init__(self, difficulty, all_letters=None):
+    # cumulative odds of drawing from the top 30% / next 40% of that order
+    BAND_ODDS = {
+        "easy": (0.15, 0.50),
+        "medium": (0.55, 0.90),
+        "hard": (0.85, 0.97),
+        "hard+": (0.85, 0.97),
+    }
+
+    def __init__(self, difficulty, all_letters=None, rng=None, band_odds=None):
         self.difficulty = (difficulty or "medium").strip().lower()
-        self.guessed = set()
-        self.all_letters = list(all_letters) if all_letters is not None else list(string.ascii_uppercase)
-        self.all_letters = [c.upper() for c in self.all_letters if c.isalpha()]
+        self.rng = rng or random
+        self.band_odds = band_odds or self.BAND_ODDS.get(self.difficulty, self.BAND_ODDS["medium"])
+        self.mask = 0
+
+        letters = ALPHABET if all_letters is None else "".join(all_letters).upper()
+        self.allowed = mask_of(letters)
 
-        ranked = [c for c in self.FREQ_ORDER if c in self.all_letters]
-        for c in self.all_letters:
-            if c not in ranked:
-                ranked.append(c)
-        self.ranked = ranked
+        # (letter, bit) pairs, most common first, walked without allocating
+        ranked = [c for c in self.FREQ_ORDER if BIT[c] & self.allowed]
+        ranked += [c for c in ALPHABET if BIT[c] & self.allowed and c not in ranked]
+        self.ranked = tuple((c, BIT[c]) for c in ranked)
 
-    def reset(self):
-        self.guessed.clear()
+    @property
+    def guessed(self):
+        return set(letters_of(self.mask))
+
+    def reset(self, word=None):
+        self.mask = 0
 
     def should_guess(self) -> bool:
         # when bot will act
         return True
 
-    def make_guess(self):
-        remaining = [l for l in self.all_letters if l not in self.guessed]
-        if not remaining:
-            return None
+    def known_phrase(self, guessed=None):
+        # strategies that can pin the phrase down return it here
+        return None
 
-        available_ranked = [c for c in self.ranked if c in remaining]
-        n = len(available_ranked)
+    def make_guess(self, guessed=None):
+        """Pick a letter not in `guessed` (a letter mask; defaults to the
+        bot's own record) and add it to the bot's record."""
+        mask = self.mask if guessed is None else guessed
+        remaining = self.allowed & ~mask
+        n = remaining.bit_count()
+        if not n:
+            return None
 
         top_end = max(1, int(n * 0.30))            # top 30%
         mid_end = max(top_end + 1, int(n * 0.70))  # up to 70%
 
-        top_band = available_ranked[:top_end]
-        mid_band = available_ranked[top_end:mid_end]
-        low_band = available_ranked[mid_end:] if mid_end < n else []
+        # bands are [lo, hi) ranges over the remaining letters in ranked order
+        top_odds, mid_odds = self.band_odds
+        r = self.rng.random()
+        if r < top_odds:
+            lo, hi = 0, top_end
+        elif r < mid_odds:
+            lo, hi = (top_end, min(mid_end, n)) if top_end < n else (0, top_end)
+        else:
+            lo, hi = (mid_end, n) if mid_end < n else (0, n)
 
-        if self.difficulty == "hard":
-            r = random.random()
-            if r < 0.85 and top_band:
-                pool = top_band
-            elif r < 0.97 and (mid_band or top_band):
-                pool = mid_band if mid_band else top_band
-            else:
-                pool = low_band if low_band else remaining
-
-        elif self.difficulty == "easy":
-            r = random.random()
-            if r < 0.15 and top_band:
-                pool = top_band
-            elif r < 0.50 and (mid_band or top_band):
-                pool = mid_band if mid_band else top_band
-            else:
-                pool = low_band if low_band else remaining
-
-        else:  # medium
-            r = random.random()
-            if r < 0.55 and top_band:
-                pool = top_band
-            elif r < 0.90 and (mid_band or top_band):
-                pool = mid_band if mid_band else top_band
+        k = lo + int(self.rng.random() * (hi - lo))
+        for letter, bit in self.ranked:
+            if remaining & bit:
+                if not k:
+                    self.mask = mask | bit
+                    return letter
+                k -= 1
+        return None
+
+
+class PhraseIndex:
+    """Corpus phrases as per-length bitsets, for CandidateBot.
+
+    For each phrase length there is one int mask per (position, character),
+    one per position holding an A-Z letter, and one per letter the phrase
+    contains; bit i stands for the i-th phrase of that length. Filtering a
+    candidate set is a handful of and/and-not operations and counting one
+    is int.bit_count().
+    """
+
+    def __init__(self, texts):
+        by_length = {}
+        for text in sorted({(t or "").upper().strip() for t in texts}):
+            if text:
+                by_length.setdefault(len(text), []).append(text)
+
+        self.phrases = by_length
+        self.at = {}
+        self.letter_at = {}
+        self.has = {}
+        self.full = {}
+
+        for length, phrases in by_length.items():
+            # set bits in bytearrays, then convert once: or-ing into a growing
+            # int would be quadratic in the number of phrases
+            size = (len(phrases) + 7) // 8
+            at, has = {}, {}
+            for i, text in enumerate(phrases):
+                byte, bit = i >> 3, 1 << (i & 7)
+                for pos, ch in enumerate(text):
+                    buf = at.get((pos, ch))
+                    if buf is None:
+                        buf = at[(pos, ch)] = bytearray(size)
+                    buf[byte] |= bit
+                for ch in set(text):
+                    if ch.isalpha():
+                        buf = has.get(ch)
+                        if buf is None:
+                            buf = has[ch] = bytearray(size)
+                        buf[byte] |= bit
+
+            self.at[length] = {k: int.from_bytes(b, "little") for k, b in at.items()}
+            self.has[length] = {k: int.from_bytes(b, "little") for k, b in has.items()}
+
+            letter_at = [0] * length
+            for (pos, ch), bits in self.at[length].items():
+                if ch in BIT:
+                    letter_at[pos] |= bits
+            self.letter_at[length] = letter_at
+            self.full[length] = (1 << len(phrases)) - 1
+
+    @classmethod
+    def for_corpus(cls, texts):
+        return _phrase_index(tuple(texts))
+
+    def candidates(self, word, hits, misses) -> int:
+        """Phrases that fit `word`'s layout and the `hits`/`misses` letter masks."""
+        length = len(word)
+        at = self.at.get(length)
+        if at is None:
+            return 0
+        has = self.has[length]
+        letter_at = self.letter_at[length]
+
+        mask = self.full[length]
+        for pos, ch in enumerate(word):
+            bit = BIT.get(ch)
+            if bit is None or bit & hits:
+                # shown on the board: spaces, punctuation, hit letters
+                mask &= at.get((pos, ch), 0)
             else:
-                pool = low_band if low_band else remaining
+                # a blank: some letter, but not a space or punctuation
+                mask &= letter_at[pos]
+            if not mask:
+                return 0
+
+        for ch in letters_of(hits):
+            # a hit shows every position of that letter, so it is nowhere else
+            for pos, other in enumerate(word):
+                if other != ch:
+                    mask &= ~at.get((pos, ch), 0)
+        for ch in letters_of(misses):
+            mask &= ~has.get(ch, 0)
+        return mask
+
+    def phrase(self, length, mask):
+        """The phrase behind the lowest set bit of `mask`."""
+        return self.phrases[length][(mask & -mask).bit_length() - 1]
+
+    def best_letter(self, length, mask, exclude, order):
+        """The letter whose answer (which positions it fills, if any) splits
+        the candidates most evenly; ties go to the likelier hit. `order` is
+        (letter, bit) pairs; letters in the `exclude` mask are skipped."""
+        at = self.at[length]
+        has = self.has[length]
+        n = mask.bit_count()
+
+        best, best_score = None, None
+        for letter, bit in order:
+            if bit & exclude:
+                continue
+            hit = (mask & has.get(letter, 0)).bit_count()
+            if not hit:
+                continue
+
+            groups = [mask]
+            for pos in range(length):
+                bits = at.get((pos, letter))
+                if not bits:
+                    continue
+                split = []
+                for g in groups:
+                    inside = g & bits
+                    if inside:
+                        split.append(inside)
+                        if inside != g:
+                            split.append(g & ~bits)
+                    else:
+                        split.append(g)
+                groups = split
+
+            entropy = 0.0
+            for g in groups:
+                p = g.bit_count() / n
+                entropy -= p * math.log2(p)
+
+            score = (entropy, hit)
+            if best_score is None or score > best_score:
+                best, best_score = letter, score
+        return best
+
+
+@functools.lru_cache(maxsize=2)
+def _phrase_index(texts):
+    return PhraseIndex(texts)
+
+
+class CandidateBot(BotPlayer):
+    """Hard+: keeps the corpus phrases that still fit what it has seen
+    and guesses the most informative letter. Falls back to the frequency
+    bands when the phrase is not in the corpus."""
+
+    def __init__(self, difficulty, word, index, all_letters=None, rng=None, band_odds=None):
+        super().__init__(difficulty, all_letters, rng=rng, band_odds=band_odds)
+        # the bot only uses `word` for what it would see: its hit positions
+        self.word = word
+        self.letters = mask_of(word)
+        self.index = index
+        self._seen = None
+        self._mask = 0
+
+    def reset(self, word=None):
+        super().reset()
+        if word is not None:
+            self.word = word
+            self.letters = mask_of(word)
+        self._seen = None
+        self._mask = 0
+
+    def candidates(self, guessed=None) -> int:
+        guessed = self.mask if guessed is None else guessed
+        if self._seen != guessed:
+            hits = guessed & self.letters
+            self._mask = self.index.candidates(self.word, hits, guessed & ~hits)
+            self._seen = guessed
+        return self._mask
+
+    def known_phrase(self, guessed=None):
+        mask = self.candidates(guessed)
+        if mask and not mask & (mask - 1):
+            return self.index.phrase(len(self.word), mask)
+        return None
 
-        guess = random.choice(pool)
-        self.guessed.add(guess)
-        return guess
+    def make_guess(self, guessed=None):
+        guessed = self.mask if guessed is None else guessed
+        mask = self.candidates(guessed)
+        if mask:
+            guess = self.index.best_letter(len(self.word), mask, guessed, self.ranked)
+            if guess is not None:
+                self.mask = guessed | BIT[guess]
+                return guess
+        return super().make_guess(guessed)
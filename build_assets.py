@@ -0,0 +1,165 @@
+"""Build-time asset step for character packs.
+
+Writes character_manifest.json: the valid characters per category, each
+part's file, pixel size and checksum, and the entries from
+character_offsets.json. The game reads this one file at startup instead of
+walking images/images/.
+
+Also packs every category's parts, pre-scaled to their `_scale`, into
+images/atlas/<category>.png with a <category>.json rect table next to it.
+
+Run from the project root before packaging:
+
+    python build_assets.py
+"""
+import json
+import os
+
+from PIL import Image
+
+from character_loader import BASE_IMAGES_DIR, MANIFEST_PATH, PART_FILES
+from security import file_checksum
+from sprite_cache import ATLAS_DIR
+
+OFFSETS_PATH = "character_offsets.json"
+
+ATLAS_WIDTH = 1024
+ATLAS_PADDING = 1
+DEFAULT_SCALE = 120
+
+
+def _load_offsets(path=OFFSETS_PATH):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _describe_character(folder):
+    parts = {}
+    for part_name, filename in PART_FILES.items():
+        path = os.path.join(folder, filename)
+        if not os.path.exists(path):
+            return None
+        try:
+            with Image.open(path) as im:
+                size = list(im.size)
+        except Exception:
+            return None
+        parts[part_name] = {"file": filename, "size": size, "sha256": file_checksum(path)}
+    return parts
+
+
+def build_manifest(base_dir=BASE_IMAGES_DIR, offsets_path=OFFSETS_PATH):
+    categories = {}
+    characters = {}
+
+    for category in sorted(os.listdir(base_dir)):
+        cat_dir = os.path.join(base_dir, category)
+        if not os.path.isdir(cat_dir):
+            continue
+
+        categories[category] = []
+        for name in sorted(os.listdir(cat_dir)):
+            folder = os.path.join(cat_dir, name)
+            if not os.path.isdir(folder):
+                continue
+            parts = _describe_character(folder)
+            if parts is None:
+                print(f"skipping {category}/{name}: missing or unreadable parts")
+                continue
+            categories[category].append(name)
+            characters[name] = {"category": category, "parts": parts}
+
+    return {
+        "version": 2,
+        "categories": categories,
+        "characters": characters,
+        "offsets": _load_offsets(offsets_path),
+    }
+
+
+def write_manifest(path=MANIFEST_PATH):
+    manifest = build_manifest()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return manifest
+
+
+# atlas
+def _scale_for(offsets, name, torso_width):
+    # same lookup and formula as HangmanGame._get_scaled_part
+    want = name.strip().lower()
+    key = next((k for k in offsets if k.strip().lower() == want), name)
+    target_width = int(offsets.get(key, {}).get("_scale", DEFAULT_SCALE))
+    return (target_width / float(torso_width)) if torso_width else 1.0
+
+
+def _shelf_pack(sprites, width):
+    # tallest first, left to right, new shelf when the row is full
+    placed = {}
+    x = y = shelf_h = 0
+    for key, im in sorted(sprites.items(), key=lambda kv: kv[1].size[1], reverse=True):
+        w, h = im.size
+        if x and x + w > width:
+            x, y, shelf_h = 0, y + shelf_h + ATLAS_PADDING, 0
+        placed[key] = (x, y, w, h)
+        x += w + ATLAS_PADDING
+        shelf_h = max(shelf_h, h)
+    return placed, y + shelf_h
+
+
+def build_atlas(category, names, manifest, out_dir=ATLAS_DIR):
+    offsets = manifest["offsets"]
+    scaled = {}
+    scales = {}
+
+    for name in names:
+        folder = os.path.join(BASE_IMAGES_DIR, category, name)
+        parts = manifest["characters"][name]["parts"]
+        factor = _scale_for(offsets, name, parts["torso"]["size"][0])
+        scales[name] = factor
+
+        for part_name, info in parts.items():
+            with Image.open(os.path.join(folder, info["file"])) as im:
+                im = im.convert("RGBA")
+                w, h = im.size
+                scaled[(name, part_name)] = im.resize(
+                    (max(1, int(w * factor)), max(1, int(h * factor))), Image.LANCZOS
+                )
+
+    if not scaled:
+        return None
+
+    width = max(ATLAS_WIDTH, max(im.size[0] for im in scaled.values()))
+    rects, height = _shelf_pack(scaled, width)
+
+    atlas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    for key, (x, y, _, _) in rects.items():
+        atlas.paste(scaled[key], (x, y))
+
+    os.makedirs(out_dir, exist_ok=True)
+    image_name = f"{category}.png"
+    atlas.save(os.path.join(out_dir, image_name), optimize=True)
+
+    table = {"image": image_name, "characters": {}}
+    for (name, part_name), rect in rects.items():
+        entry = table["characters"].setdefault(name, {"scale": scales[name], "parts": {}})
+        entry["parts"][part_name] = list(rect)
+
+    with open(os.path.join(out_dir, f"{category}.json"), "w", encoding="utf-8") as f:
+        json.dump(table, f, indent=2)
+        f.write("\n")
+    return table
+
+
+if __name__ == "__main__":
+    m = write_manifest()
+    print(f"wrote {MANIFEST_PATH}: {len(m['characters'])} characters")
+
+    for category, names in m["categories"].items():
+        if build_atlas(category, names, m):
+            print(f"wrote {os.path.join(ATLAS_DIR, category)}.png")
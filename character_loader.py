@@ -1,8 +1,13 @@
+import json
 import os
 import random
-import tkinter as tk
+
+from PIL import Image
+
+import image_pipeline
 
 BASE_IMAGES_DIR = os.path.join("images", "images")
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "character_manifest.json")
 
 CATEGORY_MAP = {
     "cowboy": "cowboys",
@@ -26,49 +31,112 @@ def _normalize_category(category: str) -> str:
 
 
 def _load_character_folder(folder_path: str):
+    # runs on the image worker pool; folders come from the manifest, so a
+    # missing file just fails the check
     parts = {}
     for part_name, filename in PART_FILES.items():
         full_path = os.path.join(folder_path, filename)
-        if not os.path.exists(full_path):
-            return None
         try:
-            img = tk.PhotoImage(file=full_path)
-            parts[part_name] = (img, full_path)
+            with Image.open(full_path) as im:
+                im.verify()
+            parts[part_name] = (None, full_path)
         except Exception:
             return None
     return parts
 
 
-def _get_character_folders_for_category(category: str):
-    norm = _normalize_category(category)
-    subdir = CATEGORY_MAP.get(norm)
-    base = os.path.join(BASE_IMAGES_DIR, subdir) if subdir else BASE_IMAGES_DIR
+def _scan_categories(base_dir=BASE_IMAGES_DIR):
+    categories = {}
+    if not os.path.isdir(base_dir):
+        return categories
 
-    if not os.path.isdir(base):
-        return []
+    for category in sorted(os.listdir(base_dir)):
+        cat_dir = os.path.join(base_dir, category)
+        if not os.path.isdir(cat_dir):
+            continue
+        categories[category] = [
+            name
+            for name in sorted(os.listdir(cat_dir))
+            if all(os.path.exists(os.path.join(cat_dir, name, f)) for f in PART_FILES.values())
+        ]
+    return categories
 
-    return [
-        os.path.join(base, name)
-        for name in os.listdir(base)
-        if os.path.isdir(os.path.join(base, name))
-    ]
 
+_manifest = None
+
+
+def load_manifest():
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(MANIFEST_PATH, "r", encoding="utf-8") as f:
+                _manifest = json.load(f)
+        except (OSError, ValueError):
+            # no prebuilt manifest (see build_assets.py): scan once for this run
+            _manifest = {"categories": _scan_categories()}
+    return _manifest
 
-def load_two_random_characters(category: str):
-    folders = _get_character_folders_for_category(category)
-    random.shuffle(folders)
 
-    valid_characters = []
-    for folder in folders:
-        parts = _load_character_folder(folder)
-        if parts:
-            char_name = os.path.basename(folder)
-            valid_characters.append((char_name, parts))
+def character_category(char_name: str):
+    return load_manifest().get("characters", {}).get(char_name, {}).get("category")
 
-    if len(valid_characters) == 0:
-        return load_two_random_characters("pixar")
 
-    if len(valid_characters) == 1:
-        return valid_characters[0], valid_characters[0]
+def part_size(char_name: str, part: str):
+    info = load_manifest().get("characters", {}).get(char_name, {}).get("parts", {}).get(part)
+    return tuple(info["size"]) if info else None
 
-    return random.sample(valid_characters, 2)
+
+def _get_character_folders_for_category(category: str):
+    subdir = CATEGORY_MAP.get(_normalize_category(category))
+    if not subdir:
+        return []
+
+    names = load_manifest().get("categories", {}).get(subdir, [])
+    return [os.path.join(BASE_IMAGES_DIR, subdir, name) for name in names]
+
+
+def request_two_random_characters(widget, category: str, callback):
+    """Pick two loadable characters, falling back to pixar.
+
+    The folder checks run on the image pool, a batch at a time, and
+    `callback(((name, parts), (name, parts)))` is called on the Tk thread,
+    with None if nothing loadable was found. Never waits on the pool.
+    """
+    folders = _get_character_folders_for_category(category)
+    random.shuffle(folders)
+    found = []
+
+    def next_batch():
+        if not folders or len(found) >= 2:
+            finish()
+            return
+        need = 2 - len(found)
+        batch = folders[:need]
+        del folders[:need]
+        jobs = [(folder, image_pipeline.submit(_load_character_folder, folder)) for folder in batch]
+        collect(jobs, 0)
+
+    def collect(jobs, i):
+        # the jobs run in parallel; this just takes their results in order
+        if i == len(jobs):
+            next_batch()
+            return
+        folder, job = jobs[i]
+
+        def done(parts):
+            if parts:
+                found.append((os.path.basename(folder), parts))
+            collect(jobs, i + 1)
+
+        image_pipeline.when_done(widget, job, done)
+
+    def finish():
+        if not found:
+            if CATEGORY_MAP.get(_normalize_category(category)) == "pixar":
+                callback(None)
+            else:
+                request_two_random_characters(widget, "pixar", callback)
+            return
+        callback((found[0], found[1] if len(found) > 1 else found[0]))
+
+    next_batch()
@@ -0,0 +1,344 @@
+import functools
+import random
+
+from bot_player import BotPlayer, CandidateBot
+from letter_mask import ALPHABET, BIT, mask_of, nth_letter
+
+PARTS_ORDER = ("torso", "head", "left_arm", "right_arm", "left_leg", "right_leg")
+MAX_PARTS = len(PARTS_ORDER)
+
+# per-difficulty bot knobs; simulate.py sweeps these
+#   correct_chance      odds the bot "knows" a letter in the word
+#   phrase_base         odds of calling the phrase once phrase_ratio is met
+#   phrase_ratio        share of the word's letters the bot must have hit
+#   top_odds, mid_odds  BotPlayer band odds for ordinary guesses
+BOT_TUNING = {
+    "easy": {"correct_chance": 0.35, "phrase_base": 0.12, "phrase_ratio": 0.65},
+    "medium": {"correct_chance": 0.50, "phrase_base": 0.18, "phrase_ratio": 0.55},
+    "hard": {"correct_chance": 0.65, "phrase_base": 0.25, "phrase_ratio": 0.45},
+    # hard's odds, but ordinary guesses come from CandidateBot
+    "hard+": {"correct_chance": 0.65, "phrase_base": 0.25, "phrase_ratio": 0.45},
+}
+for _difficulty, _knobs in BOT_TUNING.items():
+    _knobs["top_odds"], _knobs["mid_odds"] = BotPlayer.BAND_ODDS[_difficulty]
+
+
+# difficulties that play on another level's phrases
+PHRASE_DIFFICULTY = {"hard+": "hard"}
+
+
+def phrase_difficulty(difficulty):
+    """The phrase (and leaderboard) difficulty a game difficulty draws from."""
+    difficulty = (difficulty or "medium").strip().lower()
+    return PHRASE_DIFFICULTY.get(difficulty, difficulty)
+
+
+def bot_tuning(difficulty, **overrides):
+    """The knobs for `difficulty` with `overrides` applied on top."""
+    tuning = dict(BOT_TUNING.get(difficulty, BOT_TUNING["medium"]))
+    tuning.update(overrides)
+    return tuning
+
+
+# events: (kind, who, value)
+HIT = "hit"              # value: letter
+MISS = "miss"            # value: letter
+REPEAT = "repeat"        # value: letter, already guessed; nothing changed
+INVALID = "invalid"      # value: the rejected input
+LIMBS = "limbs"          # value: parts now shown for `who`
+SCORE = "score"          # value: new score
+BONUS = "bonus"          # player must call choose_bonus("take" | "add")
+TURN = "turn"            # who: whose turn it is now
+GAME_OVER = "game_over"  # who: winner, value: how it ended
+
+# how a game ended
+SOLVED = "solved"        # player revealed every letter
+CALLED = "called"        # phrase guessed outright
+HANGED = "hanged"        # loser ran out of parts
+
+
+class GameState:
+    __slots__ = (
+        "word", "letters", "letter_count", "positions", "difficulty", "turn", "guessed", "tried", "bot_guessed",
+        "wrong", "bot_wrong", "player_miss_streak", "bot_miss_streak",
+        "player_correct_streak", "score", "over", "winner", "ending", "pending_bonus",
+    )
+
+    def __init__(self, word, difficulty):
+        self.difficulty = difficulty
+        self.reset(word)
+
+    def reset(self, word):
+        self.word = word
+        # letter masks (see letter_mask.py) and letter -> positions, so a hit
+        # only touches those; fixed per phrase and shared between games
+        self.letters, self.letter_count, self.positions = _phrase_facts(word)
+        self.turn = "player"
+        self.guessed = 0  # the player's hits
+        self.tried = 0    # every letter the player has guessed, hit or miss
+        self.bot_guessed = 0
+        self.wrong = 0
+        self.bot_wrong = 0
+        self.player_miss_streak = 0
+        self.bot_miss_streak = 0
+        self.player_correct_streak = 0
+        self.score = 0
+        self.over = False
+        self.winner = None
+        self.ending = None
+        self.pending_bonus = False
+
+
+@functools.lru_cache(maxsize=4096)
+def _phrase_facts(word):
+    letters = mask_of(word)
+    positions = {}
+    for pos, ch in enumerate(word):
+        if ch in BIT:
+            positions.setdefault(ch, []).append(pos)
+    return letters, letters.bit_count(), {ch: tuple(p) for ch, p in positions.items()}
+
+
+class GameEngine:
+    """The duel rules, with no Tk in sight.
+
+    Commands return a list of (kind, who, value) events for the view to
+    render. `storage`, when given, receives record_guess(who, letter, correct),
+    add_score() and finish(status, score) calls. `index` is the
+    bot_player.PhraseIndex the hard+ bot filters.
+    """
+
+    def __init__(self, word, difficulty="medium", rng=None, storage=None, tuning=None, score=0, index=None):
+        self.difficulty = (difficulty or "medium").strip().lower()
+        self.rng = rng or random.Random()
+        self.storage = storage
+        self.tuning = bot_tuning(self.difficulty, **(tuning or {}))
+
+        self._correct_chance, self._phrase_odds = self._bot_odds()
+
+        self.state = GameState((word or "PYTHON").upper().strip(), self.difficulty)
+        self.state.score = score or 0
+        self._phrase_hits = self._hits_needed()
+        band_odds = (self.tuning["top_odds"], self.tuning["mid_odds"])
+        if self.difficulty == "hard+" and index is not None:
+            self.bot = CandidateBot(self.difficulty, self.state.word, index, ALPHABET, rng=self.rng, band_odds=band_odds)
+        else:
+            self.bot = BotPlayer(self.difficulty, ALPHABET, rng=self.rng, band_odds=band_odds)
+        self._knows_phrases = isinstance(self.bot, CandidateBot)
+
+    def new_game(self, word, score=0):
+        """Start over on `word` with the same bot and settings. Cheaper than a
+        new engine; simulate.py plays whole chunks on one."""
+        self.state.reset((word or "PYTHON").upper().strip())
+        self.state.score = score or 0
+        self._phrase_hits = self._hits_needed()
+        self.bot.reset(self.state.word)
+
+    def _hits_needed(self):
+        # phrase_ratio as a count of the phrase's letters
+        return self.tuning["phrase_ratio"] * self.state.letter_count
+
+    # storage
+    def _record(self, who, letter, correct):
+        if self.storage is not None:
+            self.storage.record_guess(who, letter, correct)
+
+    def _add_score(self, events):
+        self.state.score += 1
+        if self.storage is not None:
+            self.storage.add_score()
+        events.append((SCORE, "player", self.state.score))
+
+    def _finish(self, events, winner, how):
+        s = self.state
+        s.over = True
+        s.winner = winner
+        s.ending = how
+        if self.storage is not None:
+            self.storage.finish("won" if winner == "player" else "lost", s.score)
+        events.append((GAME_OVER, winner, how))
+
+    def _set_turn(self, events, who):
+        self.state.turn = who
+        events.append((TURN, who, None))
+
+    def _limb(self, events, who, delta):
+        s = self.state
+        if who == "player":
+            wrong = s.wrong + delta
+            s.wrong = wrong = MAX_PARTS if wrong > MAX_PARTS else 0 if wrong < 0 else wrong
+        else:
+            wrong = s.bot_wrong + delta
+            s.bot_wrong = wrong = MAX_PARTS if wrong > MAX_PARTS else 0 if wrong < 0 else wrong
+        events.append((LIMBS, who, wrong))
+
+    def _can_player_act(self):
+        s = self.state
+        return not s.over and s.turn == "player" and not s.pending_bonus
+
+    # player commands
+    def guess_letter(self, letter):
+        events = []
+        if not self._can_player_act():
+            return events
+
+        s = self.state
+        guess = letter
+        bit = BIT.get(guess)
+        if bit is None:
+            guess = (letter or "").upper().strip()
+            bit = BIT.get(guess)
+            if bit is None:
+                events.append((INVALID, "player", letter))
+                return events
+        if s.guessed & bit:
+            events.append((REPEAT, "player", guess))
+            return events
+
+        correct = bool(s.letters & bit)
+        s.tried |= bit
+        self._record("player", guess, correct)
+
+        if not correct:
+            self._player_wrong(events, guess, extra_penalty=False)
+            return events
+
+        s.guessed |= bit
+        s.player_correct_streak += 1
+        s.player_miss_streak = 0
+        events.append((HIT, "player", guess))
+        self._add_score(events)
+
+        if not s.letters & ~s.guessed:
+            self._finish(events, "player", SOLVED)
+        elif s.player_correct_streak == 2:
+            s.player_correct_streak = 0
+            s.pending_bonus = True
+            events.append((BONUS, "player", None))
+        return events
+
+    def guess_phrase(self, text):
+        events = []
+        if not self._can_player_act():
+            return events
+
+        s = self.state
+        normalized = (text or "").upper().strip()
+        correct = normalized == s.word
+        self._record("player", normalized[0] if normalized else "?", correct)
+
+        if correct:
+            s.guessed |= s.letters
+            events.append((HIT, "player", None))
+            self._add_score(events)
+            self._finish(events, "player", CALLED)
+        else:
+            self._player_wrong(events, None, extra_penalty=True)
+        return events
+
+    def choose_bonus(self, choice):
+        events = []
+        s = self.state
+        if not s.pending_bonus:
+            return events
+        s.pending_bonus = False
+
+        if choice == "take" and s.wrong > 0:
+            self._limb(events, "player", -1)
+        elif choice == "add" and s.bot_wrong < MAX_PARTS:
+            self._limb(events, "bot", +1)
+            if s.bot_wrong >= MAX_PARTS:
+                self._finish(events, "player", HANGED)
+        return events
+
+    def _player_wrong(self, events, guess, extra_penalty):
+        s = self.state
+        s.player_correct_streak = 0
+        s.player_miss_streak += 1
+        events.append((MISS, "player", guess))
+        self._limb(events, "player", 2 if extra_penalty else 1)
+
+        if s.wrong >= MAX_PARTS:
+            self._finish(events, "bot", HANGED)
+            return
+
+        if s.player_miss_streak >= 2:
+            s.player_miss_streak = 0
+            self._set_turn(events, "bot")
+
+    # bot
+    def bot_step(self):
+        """One bot action. Call again while the turn stays with the bot."""
+        events = []
+        s = self.state
+        if s.over or s.turn != "bot":
+            return events
+
+        if self._bot_should_guess_phrase():
+            self._finish(events, "bot", CALLED)
+            return events
+
+        guess = self._bot_choose_letter()
+        if not guess:
+            self._set_turn(events, "player")
+            return events
+
+        bit = BIT[guess]
+        s.bot_guessed |= bit
+        correct = bool(s.letters & bit)
+        self._record("bot", guess, correct)
+
+        if correct:
+            s.bot_miss_streak = 0
+            events.append((HIT, "bot", guess))
+        else:
+            s.bot_miss_streak += 1
+            events.append((MISS, "bot", guess))
+            self._limb(events, "bot", +1)
+
+            if s.bot_wrong >= MAX_PARTS:
+                self._finish(events, "player", HANGED)
+                return events
+
+        if s.bot_miss_streak >= 2:
+            s.bot_miss_streak = 0
+            self._set_turn(events, "player")
+        return events
+
+    def _bot_choose_letter(self):
+        s = self.state
+        unguessed_in_word = s.letters & ~s.bot_guessed
+        if unguessed_in_word and self.rng.random() < self._correct_chance[s.bot_wrong]:
+            return nth_letter(unguessed_in_word, int(self.rng.random() * unguessed_in_word.bit_count()))
+
+        return self.bot.make_guess(s.bot_guessed)
+
+    def _bot_should_guess_phrase(self) -> bool:
+        s = self.state
+        if not s.letters:
+            return False
+
+        if self._knows_phrases and self.bot.known_phrase(s.bot_guessed) == s.word:
+            return True
+
+        return (
+            (s.letters & s.bot_guessed).bit_count() >= self._phrase_hits
+            and self.rng.random() < self._phrase_odds[s.bot_wrong]
+        )
+
+    def _bot_odds(self):
+        """Per-game lookup tables, indexed by the bot's parts shown."""
+        correct, phrase = [], []
+        for wrong in range(MAX_PARTS + 1):
+            parts_left = MAX_PARTS - wrong
+            p = self.tuning["correct_chance"]
+            base = self.tuning["phrase_base"]
+            if parts_left <= 2:
+                p += 0.20
+                base += 0.25
+            elif parts_left <= 3:
+                p += 0.10
+                base += 0.15
+            correct.append(min(0.90, max(0.05, p)))
+            phrase.append(min(base, 0.60))
+        return tuple(correct), tuple(phrase)
@@ -1,13 +1,17 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog
-from PIL import Image, ImageTk
-import random
 import os
 import json
 
-from supabase_client import db
-from character_loader import load_two_random_characters
-from bot_player import BotPlayer
+from supabase_client import db, leaderboards, writes
+from character_loader import character_category, load_manifest, part_size, request_two_random_characters
+from game_engine import (
+    BONUS, CALLED, GAME_OVER, HIT, INVALID, LIMBS, MAX_PARTS, PARTS_ORDER, REPEAT, SCORE, SOLVED, TURN,
+    GameEngine, phrase_difficulty,
+)
+from image_store import images
+from letter_mask import BIT, letters_of
+from sprite_cache import sprites
 
 
 class HangmanGame(tk.Frame):
@@ -16,67 +20,49 @@ class HangmanGame(tk.Frame):
         self.master = master
         self.username = username
         self.difficulty = (difficulty or "medium").lower()
-        self.game_over = False
-
-        # turn
-        self.turn = "player"
-        self.player_miss_streak = 0
-        self.bot_miss_streak = 0
         self._bot_after_id = None
 
         # phrase
         self.category = "General"
-        phrase = None
         self.phraseid = None
+        phrase = None
 
-        for _ in range(10):
-            try:
-                result = db.get_random_phrase(self.difficulty)
-            except Exception:
-                phrase = "PYTHON"
-                break
-
-            temp_category = "General"
-            temp_phrase = None
-            temp_phraseid = None
-
-            if isinstance(result, tuple):
-                if len(result) >= 3:
-                    temp_phraseid, temp_phrase, temp_category = result[0], result[1], result[2]
-                elif len(result) == 2:
-                    temp_phraseid, temp_phrase = result[0], result[1]
-                else:
-                    temp_phraseid = result[0]
-            else:
-                temp_phraseid = result
-
-            if temp_category and str(temp_category).strip().lower() == "music":
-                continue
-
-            self.phraseid = temp_phraseid
-            phrase = temp_phrase
-            self.category = temp_category or "General"
-            break
+        try:
+            self.phraseid, phrase, category = db.get_random_phrase(phrase_difficulty(self.difficulty))
+            self.category = category or "General"
+        except Exception:
+            pass
 
         if phrase is None:
             phrase = "PYTHON"
 
-        self.word = (phrase or "PYTHON").upper().strip()
-
         # db
-        self.playerid = db.get_or_create_player(username)
-        self.bot_playerid = db.get_or_create_player("Bot")
-        self.gameid = db.start_game(self.phraseid, self.playerid)
+        self.gameid, self.playerid, self.bot_playerid, score = db.bootstrap_game(username, self.phraseid)
+
+        # rules
+        # built in the background (see _select_difficulty); until it is ready
+        # hard+ plays with the frequency bands
+        index = None
+        if self.difficulty == "hard+":
+            try:
+                index = db.phrase_index(phrase_difficulty(self.difficulty))
+            except Exception:
+                pass
 
-        # state
-        self.guessed = set()
-        self.wrong_guesses = 0
-        self.bot_wrong_guesses = 0
-        self.player_correct_streak = 0
+        self.engine = GameEngine(
+            phrase,
+            self.difficulty,
+            storage=_GameWrites(self.gameid, self.playerid, self.bot_playerid, phrase_difficulty(self.difficulty)),
+            score=score,
+            index=index,
+        )
+        self.game = self.engine.state
+        self.word = self.game.word
 
-        self.parts_order = ["torso", "head", "left_arm", "right_arm", "left_leg", "right_leg"]
-        self.max_parts = len(self.parts_order)
+        self.parts_order = list(PARTS_ORDER)
+        self.max_parts = MAX_PARTS
 
+        # one entry per visible part, None where the character has no image
         self.drawn_parts = []
         self.bot_drawn_parts = []
         self.player_items = []
@@ -145,6 +131,7 @@ class HangmanGame(tk.Frame):
             bg="#b7956b"
         ).pack()
 
+        self._reset_lines()
         self.word_var = tk.StringVar()
         tk.Label(
             self.bottom_frame,
@@ -155,7 +142,6 @@ class HangmanGame(tk.Frame):
         ).pack()
         self.update_word_display()
 
-        self.bot = BotPlayer(self.difficulty, [chr(i) for i in range(65, 91)])
         self.bot_word_var = tk.StringVar()
         tk.Label(
             self.bottom_frame,
@@ -216,10 +202,8 @@ class HangmanGame(tk.Frame):
         self.player_characterid = ""
         self.villain_characterid = ""
 
-        try:
-            (self.player_characterid, self.images), (self.villain_characterid, self.villain_images) = load_two_random_characters(self.category)
-        except Exception:
-            pass
+        # checked on the image pool; parts drawn before they arrive are blanks
+        request_two_random_characters(self.canvas, self.category, self._characters_ready)
 
         if self.play_bg_item is not None:
             self.canvas.tag_lower(self.play_bg_item)
@@ -235,23 +219,19 @@ class HangmanGame(tk.Frame):
 
     # bg in canvas
     def _load_and_draw_play_background(self):
-        try:
-            if not os.path.exists(self.play_bg_path):
+        w = int(self.canvas.cget("width"))
+        h = int(self.canvas.cget("height"))
+
+        def ready(img):
+            if img is None:
                 self.canvas.configure(bg="#b7956b")
                 return
-
-            w = int(self.canvas.cget("width"))
-            h = int(self.canvas.cget("height"))
-
-            im = Image.open(self.play_bg_path).convert("RGB")
-            im = im.resize((w, h), Image.LANCZOS)
-            self.play_bg_img = ImageTk.PhotoImage(im)
-
+            self.play_bg_img = img
             self.canvas.delete("bg")
             self.play_bg_item = self.canvas.create_image(0, 0, image=self.play_bg_img, anchor="nw", tags=("bg",))
             self.canvas.tag_lower(self.play_bg_item)
-        except Exception:
-            self.canvas.configure(bg="#b7956b")
+
+        images.request_photo(self.canvas, self.play_bg_path, (w, h), ready)
 
     # tweaks
     def _normalize_key(self, k: str) -> str:
@@ -266,6 +246,10 @@ class HangmanGame(tk.Frame):
         return cname
 
     def _load_tweaks(self):
+        offsets = load_manifest().get("offsets")
+        if isinstance(offsets, dict):
+            return offsets
+
         if os.path.exists(self.tweak_path):
             try:
                 with open(self.tweak_path, "r", encoding="utf-8") as f:
@@ -290,7 +274,7 @@ class HangmanGame(tk.Frame):
 
         return ax + bx + tx, ay + by + ty
 
-    def _get_scaled_part(self, who: str, path: str):
+    def _scale_for(self, who: str, path: str = None) -> float:
         cname = self._get_char_name(who)
         key = self._resolve_existing_char_key(cname)
 
@@ -300,43 +284,72 @@ class HangmanGame(tk.Frame):
             else:
                 torso_path = self.villain_images.get("torso", (None, None))[1]
 
-            ref_path = torso_path or path
-            ref_im = Image.open(ref_path).convert("RGBA")
-            ref_w, _ = ref_im.size
-
+            size = part_size(cname, "torso")
+            ref_w = size[0] if size else sprites.ref_width(torso_path or path)
             target_width = int(self.char_tweaks.get(key, {}).get("_scale", 120))
             factor = (target_width / float(ref_w)) if ref_w else 1.0
             self._scale_cache[who][key] = factor
 
-        factor = self._scale_cache[who][key]
+        return self._scale_cache[who][key]
 
-        im = Image.open(path).convert("RGBA")
-        w, h = im.size
-        new_w = max(1, int(w * factor))
-        new_h = max(1, int(h * factor))
+    def _get_scaled_part(self, who: str, part: str, path: str):
+        cname = self._get_char_name(who)
+        return sprites.get(cname, part, self._scale_for(who, path), path, category=character_category(cname))
 
-        im = im.resize((new_w, new_h), Image.LANCZOS)
-        return ImageTk.PhotoImage(im)
+    def _characters_ready(self, pair):
+        if not pair:
+            return
+        (self.player_characterid, self.images), (self.villain_characterid, self.villain_images) = pair
+        self._prefetch_sprites()
+
+        # redraw any parts already shown as blanks
+        for who, items, shown in (("player", self.player_items, self.drawn_parts),
+                                  ("bot", self.bot_items, self.bot_drawn_parts)):
+            for item in items:
+                if item is not None:
+                    self.canvas.delete(item)
+            items.clear()
+            shown.clear()
+            self._sync_body(who)
+
+    def _prefetch_sprites(self):
+        # decode and scale both characters off the Tk thread before the first miss
+        jobs = []
+        for who, parts in (("player", self.images), ("bot", self.villain_images)):
+            if not parts:
+                continue
+            cname = self._get_char_name(who)
+            try:
+                factor = self._scale_for(who)
+            except Exception:
+                continue
+            for part, (_, path) in parts.items():
+                jobs.append((cname, part, factor, path, character_category(cname)))
+        sprites.prefetch(self.canvas, jobs)
 
     # text
-    def update_word_display(self):
-        display = " ".join([letter if (letter in self.guessed or letter == " ") else "_" for letter in self.word])
-        self.word_var.set(display)
-
-    def update_bot_word_display(self):
-        pieces = []
-        for ch in self.word:
-            if ch == " ":
-                pieces.append(" ")
-            elif ch in self.bot.guessed:
-                pieces.append("X")
-            else:
-                pieces.append("_")
-        self.bot_word_var.set(" ".join(pieces))
+    def _reset_lines(self):
+        # reveal buffers: one slot per character, separators shown from the start
+        self._player_line = [ch if ch not in BIT else "_" for ch in self.word]
+        self._bot_line = list(self._player_line)
+
+    def update_word_display(self, letter=None):
+        # only `letter`'s positions change; None re-reveals every guessed letter
+        line = self._player_line
+        for ch in (letter,) if letter else letters_of(self.game.guessed):
+            for pos in self.game.positions.get(ch, ()):
+                line[pos] = ch
+        self.word_var.set(" ".join(line))
+
+    def update_bot_word_display(self, letter=None):
+        line = self._bot_line
+        for ch in (letter,) if letter else letters_of(self.game.bot_guessed):
+            for pos in self.game.positions.get(ch, ()):
+                line[pos] = "X"
+        self.bot_word_var.set(" ".join(line))
 
     def update_score_display(self):
-        score = db.get_score(self.gameid, self.playerid)
-        self.score_var.set(f"Score: {score}")
+        self.score_var.set(f"Score: {self.game.score}")
 
     # cancel bot loop
     def _cancel_bot_after(self):
@@ -349,19 +362,16 @@ class HangmanGame(tk.Frame):
 
     # turns
     def _set_turn(self, who: str):
-        if self.game_over:
+        if self.game.over:
             return
 
-        if who != "bot":
-            self._cancel_bot_after()
+        self._cancel_bot_after()
 
-        self.turn = who
         if who == "bot":
             self.turn_var.set("BOT'S TURN")
             self.entry.config(state="disabled")
             self.guess_btn.config(state="disabled")
             self.phrase_btn.config(state="disabled")
-            self._cancel_bot_after()
             self._bot_after_id = self.after(450, self.bot_turn)
         else:
             self.turn_var.set("YOUR TURN")
@@ -371,70 +381,31 @@ class HangmanGame(tk.Frame):
             self.entry.focus_set()
 
     # draw
-    def _redraw_player_body(self):
-        for item in self.player_items:
-            self.canvas.delete(item)
-        self.player_items.clear()
-        self.drawn_parts.clear()
-
-        if self.play_bg_item is not None:
-            self.canvas.tag_lower(self.play_bg_item)
-
-        for i in range(min(self.wrong_guesses, self.max_parts)):
-            part_name = self.parts_order[i]
-            if part_name in self.images:
-                _, path = self.images[part_name]
-                scaled = self._get_scaled_part("player", path)
-                x, y = self._part_xy("player", part_name)
-                item = self.canvas.create_image(x, y, image=scaled, anchor="center")
-                self.drawn_parts.append((scaled, item))
-                self.player_items.append(item)
-
-    def _redraw_bot_body(self):
-        for item in self.bot_items:
-            self.canvas.delete(item)
-        self.bot_items.clear()
-        self.bot_drawn_parts.clear()
-
-        if self.play_bg_item is not None:
-            self.canvas.tag_lower(self.play_bg_item)
-
-        for i in range(min(self.bot_wrong_guesses, self.max_parts)):
-            part_name = self.parts_order[i]
-            if part_name in self.villain_images:
-                _, path = self.villain_images[part_name]
-                scaled = self._get_scaled_part("bot", path)
-                x, y = self._part_xy("bot", part_name)
-                item = self.canvas.create_image(x, y, image=scaled, anchor="center")
-                self.bot_drawn_parts.append((scaled, item))
-                self.bot_items.append(item)
-
-    # limbs
-    def _remove_last_part(self, for_player: bool):
-        if for_player:
-            if self.wrong_guesses > 0:
-                self.wrong_guesses -= 1
-                self.player_health.set(self.max_parts - self.wrong_guesses)
-                self._redraw_player_body()
+    def _sync_body(self, who: str):
+        # add or remove only the parts that changed since the last sync
+        if who == "player":
+            shown, items, images = self.drawn_parts, self.player_items, self.images
+            target = min(self.game.wrong, self.max_parts)
         else:
-            if self.bot_wrong_guesses > 0:
-                self.bot_wrong_guesses -= 1
-                self.bot_health.set(self.max_parts - self.bot_wrong_guesses)
-                self._redraw_bot_body()
-
-    def _add_forced_limb(self, for_player: bool):
-        if for_player:
-            if self.wrong_guesses >= self.max_parts:
-                return
-            self.wrong_guesses += 1
-            self.player_health.set(self.max_parts - self.wrong_guesses)
-            self._redraw_player_body()
-        else:
-            if self.bot_wrong_guesses >= self.max_parts:
-                return
-            self.bot_wrong_guesses += 1
-            self.bot_health.set(self.max_parts - self.bot_wrong_guesses)
-            self._redraw_bot_body()
+            shown, items, images = self.bot_drawn_parts, self.bot_items, self.villain_images
+            target = min(self.game.bot_wrong, self.max_parts)
+
+        while len(items) > target:
+            item = items.pop()
+            shown.pop()
+            if item is not None:
+                self.canvas.delete(item)
+
+        while len(items) < target:
+            part_name = self.parts_order[len(items)]
+            scaled, item = None, None
+            if part_name in images:
+                _, path = images[part_name]
+                scaled = self._get_scaled_part(who, part_name, path)
+                x, y = self._part_xy(who, part_name)
+                item = self.canvas.create_image(x, y, image=scaled, anchor="center")
+            shown.append(scaled)
+            items.append(item)
 
     # menu
     def _go_back_to_menu(self):
@@ -450,159 +421,82 @@ class HangmanGame(tk.Frame):
         except Exception:
             pass
 
-    # end checks
-    def _check_player_win(self) -> bool:
-        if all(letter in self.guessed or letter == " " for letter in self.word):
-            try:
-                self.master.audio.play_win()
-            except Exception:
-                pass
-
-            db.update("games", {"status": "won"}, {"gameid": self.gameid})
-            self.game_over = True
-            self._cancel_bot_after()
-            messagebox.showinfo("Yeehaw!", f"You won the duel.\n\nThe word was:\n\n{self.word}")
-            self._go_back_to_menu()
-            return True
-        return False
-
-    def _player_loses(self):
-        if self.game_over:
-            return
-
+    # events
+    def _apply(self, events):
+        # render what the engine says happened, in order
+        for kind, who, value in events:
+            if kind == HIT:
+                if who == "player":
+                    if value is not None:
+                        self._play("play_good")
+                        messagebox.showinfo("Good shootin'", f"'{value}' is in there.")
+                    self.update_word_display(value)
+                else:
+                    self.update_bot_word_display(value)
+            elif kind == LIMBS:
+                health = self.player_health if who == "player" else self.bot_health
+                health.set(self.max_parts - value)
+                self._sync_body(who)
+            elif kind == SCORE:
+                self.update_score_display()
+            elif kind == BONUS:
+                self._apply(self.engine.choose_bonus(self._ask_streak_bonus()))
+            elif kind == TURN:
+                self._set_turn(who)
+            elif kind == GAME_OVER:
+                self._end_game(who, value)
+            elif kind == INVALID:
+                messagebox.showerror("Hold up, partner", "Give me one letter A-Z.")
+            elif kind == REPEAT:
+                messagebox.showinfo("Easy now", f"You already fired at '{value}'.")
+
+    def _play(self, sound):
         try:
-            self.master.audio.play_lost()
+            getattr(self.master.audio, sound)()
         except Exception:
             pass
 
-        db.update("games", {"status": "lost"}, {"gameid": self.gameid})
-
-        self.game_over = True
-        self._cancel_bot_after()
-        messagebox.showinfo("Dust settled...", f"You got outdueled.\n\nThe word was:\n\n{self.word}")
-        self._go_back_to_menu()
-
-    def _bot_loses(self):
-        if self.game_over:
-            return
-
-        try:
-            self.master.audio.play_win()
-        except Exception:
-            pass
+    def _end_game(self, winner, how):
+        if winner == "player":
+            self._play("play_win")
+            if how == CALLED:
+                message = f"You called it right.\n\nThe phrase was:\n\n{self.word}"
+            elif how == SOLVED:
+                message = f"You won the duel.\n\nThe word was:\n\n{self.word}"
+            else:
+                message = f"You win this duel.\n\nThe word was:\n\n{self.word}"
+            title = "Yeehaw!"
+        else:
+            self._play("play_lost")
+            if how == CALLED:
+                title, message = "Outgunned", f"The bot called the whole phrase.\n\nIt was:\n\n{self.word}"
+            else:
+                title, message = "Dust settled...", f"You got outdueled.\n\nThe word was:\n\n{self.word}"
 
-        db.update("games", {"status": "won"}, {"gameid": self.gameid})
-        self.game_over = True
         self._cancel_bot_after()
-        messagebox.showinfo("Yeehaw!", f"You win this duel.\n\nThe word was:\n\n{self.word}")
+        messagebox.showinfo(title, message)
         self._go_back_to_menu()
 
     # input
     def make_guess(self):
-        if self.game_over or self.turn != "player":
+        if self.game.over or self.game.turn != "player":
             return
 
-        guess = self.entry.get().upper().strip()
+        guess = self.entry.get()
         self.entry.delete(0, tk.END)
-
-        if not guess or len(guess) != 1 or not guess.isalpha():
-            messagebox.showerror("Hold up, partner", "Give me one letter A-Z.")
-            return
-
-        if guess in self.guessed:
-            messagebox.showinfo("Easy now", f"You already fired at '{guess}'.")
-            return
-
-        correct = guess in self.word
-        db.record_guess(self.gameid, self.playerid, guess, correct)
-
-        if correct:
-            self._handle_player_correct(guess)
-        else:
-            self._handle_player_wrong(extra_penalty=False)
+        self._apply(self.engine.guess_letter(guess))
 
     def guess_phrase(self):
-        if self.game_over or self.turn != "player":
+        if self.game.over or self.game.turn != "player":
             return
 
         guess = simpledialog.askstring("Call your shot", "Enter the full phrase:", parent=self)
         if guess is None:
             return
 
-        normalized = guess.upper().strip()
-        correct = (normalized == self.word)
-
-        placeholder = normalized[0] if normalized else "?"
-        try:
-            db.record_guess(self.gameid, self.playerid, placeholder, correct)
-        except Exception:
-            pass
-
-        if correct:
-            try:
-                self.master.audio.play_win()
-            except Exception:
-                pass
-
-            self.guessed.update({c for c in self.word if c != " "})
-            self.update_word_display()
-
-            try:
-                db.increment_score(self.gameid, self.playerid)
-            except Exception:
-                pass
-
-            self.update_score_display()
-            db.update("games", {"status": "won"}, {"gameid": self.gameid})
-            self.game_over = True
-            self._cancel_bot_after()
-            messagebox.showinfo("Yeehaw!", f"You called it right.\n\nThe phrase was:\n\n{self.word}")
-            self._go_back_to_menu()
-        else:
-            self._handle_player_wrong(extra_penalty=True)
-
-    def _handle_player_correct(self, letter: str):
-        try:
-            self.master.audio.play_good()
-        except Exception:
-            pass
-
-        messagebox.showinfo("Good shootin'", f"'{letter}' is in there.")
-        self.player_correct_streak += 1
-        self.player_miss_streak = 0
-
-        self.guessed.add(letter)
-        self.update_word_display()
-
-        db.increment_score(self.gameid, self.playerid)
-        self.update_score_display()
-
-        if self.player_correct_streak == 2:
-            self._apply_streak_bonus_for_player()
-            self.player_correct_streak = 0
-
-        self._check_player_win()
-
-    def _handle_player_wrong(self, extra_penalty: bool):
-        self.player_correct_streak = 0
-        self.player_miss_streak += 1
+        self._apply(self.engine.guess_phrase(guess))
 
-        self.wrong_guesses += 1
-        self.player_health.set(self.max_parts - self.wrong_guesses)
-        self._redraw_player_body()
-
-        if extra_penalty:
-            self._add_forced_limb(for_player=True)
-
-        if self.wrong_guesses >= self.max_parts:
-            self._player_loses()
-            return
-
-        if not self.game_over and self.player_miss_streak >= 2:
-            self.player_miss_streak = 0
-            self._set_turn("bot")
-
-    def _apply_streak_bonus_for_player(self):
+    def _ask_streak_bonus(self):
         choice = {"value": None}
         win = tk.Toplevel(self)
         win.title("Streak Bonus")
@@ -632,119 +526,37 @@ class HangmanGame(tk.Frame):
         tk.Button(btn_frame, text="Add (add limb to bot)", font=("Castellar", 10), command=choose_add).grid(row=0, column=1, padx=5)
 
         self.master.wait_window(win)
-
-        if choice["value"] == "take":
-            self._remove_last_part(for_player=True)
-        elif choice["value"] == "add":
-            self._add_forced_limb(for_player=False)
+        return choice["value"]
 
     # bot
     def bot_turn(self):
-        if self.game_over or self.turn != "bot":
-            return
-
-        if self._bot_should_guess_phrase():
-            try:
-                self.master.audio.play_lost()
-            except Exception:
-                pass
-
-            db.update("games", {"status": "lost"}, {"gameid": self.gameid})
-            self.game_over = True
-            self._cancel_bot_after()
-            messagebox.showinfo("Outgunned", f"The bot called the whole phrase.\n\nIt was:\n\n{self.word}")
-            self._go_back_to_menu()
-            return
-
-        guess = self._bot_choose_letter()
-        if not guess:
-            self._set_turn("player")
-            return
-
-        correct = guess in self.word
-        db.record_guess(self.gameid, self.bot_playerid, guess, correct)
-
-        if correct:
-            self.bot_miss_streak = 0
-            self.update_bot_word_display()
-        else:
-            self.bot_miss_streak += 1
-            self.bot_wrong_guesses += 1
-            self.bot_health.set(self.max_parts - self.bot_wrong_guesses)
-            self._redraw_bot_body()
-
-            if self.bot_wrong_guesses >= self.max_parts:
-                self._bot_loses()
-                return
-
-        if self.bot_miss_streak >= 2:
-            self.bot_miss_streak = 0
-            self._set_turn("player")
-            return
-
-        self._cancel_bot_after()
-        self._bot_after_id = self.after(550, self.bot_turn)
-
-    def _bot_correct_chance(self) -> float:
-        if self.difficulty == "hard":
-            p = 0.65
-        elif self.difficulty == "medium":
-            p = 0.50
-        else:
-            p = 0.35
-
-        parts_left = self.max_parts - self.bot_wrong_guesses
-        if parts_left <= 2:
-            p += 0.20
-        elif parts_left <= 3:
-            p += 0.10
-
-        if p < 0.05:
-            p = 0.05
-        if p > 0.90:
-            p = 0.90
-
-        return p
-
-    def _bot_choose_letter(self):
-        p = self._bot_correct_chance()
-
-        unguessed_in_word = [
-            ch for ch in set(self.word)
-            if ch.isalpha() and ch not in self.bot.guessed
-        ]
-
-        if unguessed_in_word and random.random() < p:
-            return random.choice(unguessed_in_word)
-
-        return self.bot.make_guess()
+        self._bot_after_id = None
+        events = self.engine.bot_step()
+        self._apply(events)
 
-    def _bot_should_guess_phrase(self) -> bool:
-        unique_letters = [ch for ch in set(self.word) if ch.isalpha()]
-        if not unique_letters:
-            return False
+        if events and not self.game.over and self.game.turn == "bot":
+            self._bot_after_id = self.after(550, self.bot_turn)
 
-        correct_hits = sum(1 for ch in unique_letters if ch in self.bot.guessed)
-        ratio = correct_hits / max(1, len(unique_letters))
 
-        parts_left = self.max_parts - self.bot_wrong_guesses
+class _GameWrites:
+    """Engine storage: every write goes through the write-behind queue."""
 
-        if self.difficulty == "hard":
-            base = 0.25
-            need_ratio = 0.45
-        elif self.difficulty == "medium":
-            base = 0.18
-            need_ratio = 0.55
-        else:
-            base = 0.12
-            need_ratio = 0.65
+    def __init__(self, gameid, playerid, bot_playerid, difficulty):
+        self.gameid = gameid
+        self.playerids = {"player": playerid, "bot": bot_playerid}
+        self.difficulty = difficulty
 
-        if parts_left <= 2:
-            base += 0.25
-        elif parts_left <= 3:
-            base += 0.15
+    def record_guess(self, who, letter, correct):
+        writes.record_guess(self.gameid, self.playerids[who], letter, correct)
 
-        if base > 0.60:
-            base = 0.60
+    def add_score(self):
+        writes.call(db.increment_score, self.gameid, self.playerids["player"])
 
-        return ratio >= need_ratio and random.random() < base
+    def finish(self, status, score):
+        writes.update("games", {"status": status}, {"gameid": self.gameid})
+        writes.call(db.reconcile_score, self.gameid, self.playerids["player"], score)
+        # in local mode the board reads Supabase, so refetch only once the
+        # finish above has been synced there
+        difficulty = self.difficulty
+        writes.call(db.request_sync, lambda: leaderboards.invalidate(difficulty))
+        writes.flush()
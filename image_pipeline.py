@@ -0,0 +1,39 @@
+import os
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+# Pillow releases the GIL while decoding and resampling, so threads overlap
+WORKERS = min(4, os.cpu_count() or 1)
+POLL_MS = 15
+
+_pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="image")
+
+
+def submit(fn, *args, **kwargs):
+    return _pool.submit(fn, *args, **kwargs)
+
+
+def when_done(widget, future, callback, poll_ms=POLL_MS):
+    """Call `callback(result)` on the Tk thread once `future` finishes.
+
+    The result is None if the job raised. Nothing is called if `widget` has
+    been destroyed in the meantime.
+    """
+    def check():
+        try:
+            if not widget.winfo_exists():
+                return
+        except tk.TclError:
+            return
+
+        if not future.done():
+            widget.after(poll_ms, check)
+            return
+
+        try:
+            result = future.result()
+        except Exception:
+            result = None
+        callback(result)
+
+    check()
@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+import image_pipeline
+
+MAX_PHOTOS = 12
+PREVIEW_SIZE = (320, 240)
+
+
+class ImageStore:
+    """Process-wide background images: decoded once, resized PhotoImages cached by size.
+
+    Decoding and resampling run on the image worker pool; only the
+    PhotoImage is created on the Tk thread.
+    """
+
+    def __init__(self, max_photos=MAX_PHOTOS):
+        self.max_photos = max_photos
+        self._lock = threading.Lock()
+        self._decoded = {}
+        self._previews = {}
+        self._photos = OrderedDict()
+
+    # worker side
+    def image(self, path):
+        with self._lock:
+            im = self._decoded.get(path)
+        if im is None:
+            with Image.open(path) as src:
+                im = src.convert("RGB")
+            preview = im.copy()
+            preview.thumbnail(PREVIEW_SIZE)
+            with self._lock:
+                self._decoded[path] = im
+                self._previews[path] = preview
+        return im
+
+    def _resized(self, path, size):
+        return self.image(path).resize(size, Image.LANCZOS)
+
+    # Tk side
+    def cached_photo(self, path, size):
+        key = (path, tuple(size))
+        photo = self._photos.get(key)
+        if photo is not None:
+            self._photos.move_to_end(key)
+        return photo
+
+    def request_photo(self, widget, path, size, callback):
+        """Deliver a PhotoImage of `path` at `size` to `callback` (None on failure)."""
+        size = tuple(size)
+        photo = self.cached_photo(path, size)
+        if photo is not None:
+            callback(photo)
+            return
+
+        def ready(im):
+            if im is None:
+                callback(None)
+                return
+            photo = ImageTk.PhotoImage(im)
+            self._photos[(path, size)] = photo
+            while len(self._photos) > self.max_photos:
+                self._photos.popitem(last=False)
+            callback(photo)
+
+        image_pipeline.when_done(widget, image_pipeline.submit(self._resized, path, size), ready)
+
+    def preview_photo(self, path, size):
+        # fast, low-quality stand-in; None until the image has been decoded
+        with self._lock:
+            preview = self._previews.get(path)
+        if preview is None:
+            return None
+        return ImageTk.PhotoImage(preview.resize(tuple(size), Image.NEAREST))
+
+
+images = ImageStore()
@@ -0,0 +1,67 @@
+import threading
+import time
+from concurrent.futures import Future
+
+LEADERBOARD_TTL = 60.0
+LEADERBOARD_PAGE_SIZE = 50
+
+
+class LeaderboardCache:
+    """Per-difficulty leaderboard rows with a TTL and stale-while-revalidate.
+
+    `get` returns whatever is cached right away, plus a Future for a
+    background refresh when the entry is missing or older than `ttl`.
+    """
+
+    def __init__(self, fetch, ttl=LEADERBOARD_TTL):
+        self._fetch = fetch
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._pending = {}
+
+    def _key(self, difficulty):
+        return (difficulty or "").strip().lower()
+
+    def get(self, difficulty):
+        key = self._key(difficulty)
+        with self._lock:
+            entry = self._entries.get(key)
+            rows = entry[0] if entry else None
+            fresh = entry is not None and time.monotonic() - entry[1] < self.ttl
+            if fresh:
+                return rows, None
+
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = Future()
+                self._pending[key] = pending
+                threading.Thread(
+                    target=self._refresh, args=(key, pending), name="leaderboard-refresh", daemon=True
+                ).start()
+        return rows, pending
+
+    def _refresh(self, key, future):
+        try:
+            rows = self._fetch(key) or []
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(key, None)
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._entries[key] = (rows, time.monotonic())
+            self._pending.pop(key, None)
+        future.set_result(rows)
+
+    def invalidate(self, difficulty=None):
+        with self._lock:
+            if difficulty is None:
+                self._entries.clear()
+                return
+            entry = self._entries.get(self._key(difficulty))
+            if entry:
+                # keep the rows for stale-while-revalidate, just age them out
+                self._entries[self._key(difficulty)] = (entry[0], float("-inf"))
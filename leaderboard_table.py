@@ -0,0 +1,153 @@
+import threading
+import tkinter as tk
+from concurrent.futures import Future
+
+
+class LeaderboardTable(tk.Frame):
+    """Scrollable leaderboard drawn on a Canvas with a fixed pool of row items.
+
+    Only the rows in view have canvas items; scrolling moves and relabels
+    them. When the view nears the end of the loaded rows, `fetch_more(last_row)`
+    is called on a background thread for the next page.
+    """
+
+    COLUMNS = (("Rank", 80), ("Player", 260), ("Score", 130), ("Games Played", 170))
+    ROW_HEIGHT = 28
+    FONT = ("Castellar", 12)
+    HEADER_FONT = ("Castellar", 12, "bold")
+
+    def __init__(self, master, rows, fetch_more=None, page_size=50, visible_rows=10, **kwargs):
+        super().__init__(master, bg="white", bd=1, relief="solid", **kwargs)
+        self.rows = list(rows)
+        self.fetch_more = fetch_more
+        self.page_size = page_size
+        self.visible_rows = visible_rows
+
+        self._exhausted = fetch_more is None or len(self.rows) < page_size
+        self._pending = None
+
+        width = sum(w for _, w in self.COLUMNS)
+
+        header = tk.Canvas(self, width=width, height=self.ROW_HEIGHT, bg="#e0e0e0", highlightthickness=0, bd=0)
+        header.grid(row=0, column=0, sticky="ew")
+        x = 0
+        for title, w in self.COLUMNS:
+            header.create_rectangle(x, 0, x + w, self.ROW_HEIGHT, outline="#a0a0a0")
+            header.create_text(x + w // 2, self.ROW_HEIGHT // 2, text=title, font=self.HEADER_FONT)
+            x += w
+
+        self.body = tk.Canvas(
+            self,
+            width=width,
+            height=self.ROW_HEIGHT * visible_rows,
+            bg="white",
+            highlightthickness=0,
+            bd=0,
+            yscrollincrement=self.ROW_HEIGHT,
+        )
+        self.body.grid(row=1, column=0, sticky="nsew")
+
+        scrollbar = tk.Scrollbar(self, orient="vertical", command=self._yview)
+        scrollbar.grid(row=1, column=1, sticky="ns")
+        self.body.configure(yscrollcommand=scrollbar.set)
+
+        self.body.bind("<MouseWheel>", self._wheel)
+        self.body.bind("<Button-4>", lambda e: self._yview("scroll", -1, "units"))
+        self.body.bind("<Button-5>", lambda e: self._yview("scroll", 1, "units"))
+
+        # one extra slot covers a partially scrolled row
+        self._pool = [self._make_slot(width) for _ in range(visible_rows + 1)]
+        self._update_scrollregion()
+        self._refresh()
+
+    def _make_slot(self, width):
+        rect = self.body.create_rectangle(0, 0, width, self.ROW_HEIGHT, outline="#c0c0c0", state="hidden")
+        texts = []
+        x = 0
+        for _, w in self.COLUMNS:
+            texts.append(self.body.create_text(x + w // 2, self.ROW_HEIGHT // 2, font=self.FONT, state="hidden"))
+            x += w
+        return rect, texts
+
+    def _update_scrollregion(self):
+        width = sum(w for _, w in self.COLUMNS)
+        height = max(len(self.rows), self.visible_rows) * self.ROW_HEIGHT
+        self.body.configure(scrollregion=(0, 0, width, height))
+
+    # scrolling
+    def _yview(self, *args):
+        self.body.yview(*args)
+        self._refresh()
+
+    def _wheel(self, event):
+        try:
+            self._yview("scroll", int(-1 * (event.delta / 120)), "units")
+        except Exception:
+            pass
+
+    def _refresh(self):
+        first = int(self.body.canvasy(0) // self.ROW_HEIGHT)
+        width = sum(w for _, w in self.COLUMNS)
+
+        for slot, (rect, texts) in enumerate(self._pool):
+            i = first + slot
+            if i >= len(self.rows):
+                self.body.itemconfigure(rect, state="hidden")
+                for t in texts:
+                    self.body.itemconfigure(t, state="hidden")
+                continue
+
+            entry = self.rows[i]
+            top = i * self.ROW_HEIGHT
+            self.body.coords(rect, 0, top, width, top + self.ROW_HEIGHT)
+            self.body.itemconfigure(rect, state="normal")
+
+            values = (i + 1, entry.get("playername", ""), entry.get("total_score", 0), entry.get("games_played", 0))
+            x = 0
+            for t, value, (_, w) in zip(texts, values, self.COLUMNS):
+                self.body.coords(t, x + w // 2, top + self.ROW_HEIGHT // 2)
+                self.body.itemconfigure(t, text=value, state="normal")
+                x += w
+
+        if first + 2 * self.visible_rows >= len(self.rows):
+            self._load_more()
+
+    # paging
+    def _load_more(self):
+        if self._exhausted or self._pending is not None or not self.rows:
+            return
+
+        future = Future()
+        last = self.rows[-1]
+
+        def run():
+            try:
+                future.set_result(self.fetch_more(last) or [])
+            except Exception as e:
+                future.set_exception(e)
+
+        self._pending = future
+        threading.Thread(target=run, name="leaderboard-page", daemon=True).start()
+        self._await_page()
+
+    def _await_page(self):
+        if not self.winfo_exists():
+            return
+        if not self._pending.done():
+            self.after(100, self._await_page)
+            return
+
+        future, self._pending = self._pending, None
+        try:
+            page = future.result()
+        except Exception:
+            # give up quietly; the rows already shown stay
+            self._exhausted = True
+            return
+
+        if len(page) < self.page_size:
+            self._exhausted = True
+        if page:
+            self.rows.extend(page)
+            self._update_scrollregion()
+            self._refresh()
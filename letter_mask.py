@@ -0,0 +1,28 @@
+"""A-Z letter sets as 26-bit ints: bit i is chr(65 + i)."""
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+ALL_LETTERS = (1 << 26) - 1
+
+BIT = {ch: 1 << i for i, ch in enumerate(ALPHABET)}
+
+
+def mask_of(text) -> int:
+    mask = 0
+    for ch in text:
+        mask |= BIT.get(ch, 0)
+    return mask
+
+
+def letters_of(mask):
+    """The letters in `mask`, A to Z."""
+    while mask:
+        low = mask & -mask
+        yield ALPHABET[low.bit_length() - 1]
+        mask ^= low
+
+
+def nth_letter(mask, k):
+    """The k-th letter (0-based, A to Z) in `mask`."""
+    for _ in range(k):
+        mask &= mask - 1
+    return ALPHABET[(mask & -mask).bit_length() - 1]
@@ -0,0 +1,447 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+
+from backend_base import BackendBase
+from phrase_cache import CACHE_DIR, PhraseCache
+
+DB_PATH = os.path.join(CACHE_DIR, "hangversus.sqlite3")
+
+SYNC_SECONDS = 30
+
+# an outbox row that fails this many passes while Supabase is reachable is
+# parked, so one bad row cannot hold up everything journaled after it
+MAX_SYNC_ATTEMPTS = 5
+
+SCHEMA = """
+create table if not exists phrases (
+    phraseid integer primary key,
+    phrasetext text not null,
+    category text,
+    difficulty text,
+    updated_at text,
+    change_seq integer,
+    deleted integer not null default 0
+);
+
+create table if not exists players (
+    playerid integer primary key autoincrement,
+    playername text not null unique,
+    remote_id integer
+);
+
+create table if not exists games (
+    gameid integer primary key autoincrement,
+    phraseid integer,
+    status text,
+    remote_id integer,
+    client_key text
+);
+
+create table if not exists gameplayers (
+    gameid integer not null,
+    playerid integer not null,
+    score integer not null default 0,
+    primary key (gameid, playerid)
+);
+
+create table if not exists guesses (
+    guessid integer primary key autoincrement,
+    gameid integer not null,
+    playerid integer not null,
+    guessedletter text,
+    correct integer
+);
+
+create table if not exists outbox (
+    id integer primary key autoincrement,
+    kind text not null,
+    payload text not null,
+    attempts integer not null default 0,
+    parked integer not null default 0,
+    last_error text
+);
+
+-- recreated on open so older stores pick up changes to it
+drop view if exists leaderboard;
+create view leaderboard as
+select
+    pl.playername as playername,
+    lower(trim(ph.difficulty)) as difficulty,
+    sum(gp.score) as total_score,
+    count(*) as games_played
+from gameplayers gp
+join players pl on pl.playerid = gp.playerid
+join games g on g.gameid = gp.gameid
+join phrases ph on ph.phraseid = g.phraseid
+where lower(trim(g.status)) in ('won', 'lost')
+group by pl.playername, lower(trim(ph.difficulty));
+"""
+
+
+# columns added after the first release: (table, column, definition)
+ADDED_COLUMNS = (
+    ("phrases", "change_seq", "integer"),
+    ("phrases", "deleted", "integer not null default 0"),
+    ("games", "client_key", "text"),
+    ("outbox", "attempts", "integer not null default 0"),
+    ("outbox", "parked", "integer not null default 0"),
+    ("outbox", "last_error", "text"),
+)
+
+
+class LocalStore(BackendBase):
+    """SQLite storage with the same interface as SupabaseClient.
+
+    Every write is applied locally and journaled in `outbox`. When a remote
+    SupabaseClient is attached, `sync()` replays the journal against it and
+    pulls phrase changes back into the local table.
+    """
+
+    def __init__(self, path=DB_PATH, remote=None):
+        self.path = path
+        self.remote = remote
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            for table, column, definition in ADDED_COLUMNS:
+                have = {r["name"] for r in self._conn.execute(f"pragma table_info({table})")}
+                if column not in have:
+                    self._conn.execute(f"alter table {table} add column {column} {definition}")
+
+        self._bot_playerid = None
+
+        self.phrases = PhraseCache(self._pull_phrases, path=None)
+        self.phrases.add_rows(self._query("select * from phrases"))
+
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._after_sync = []
+        self._sync_thread = None
+
+    # sql helpers
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(sql, params).fetchall()]
+
+    def _execute(self, sql, params=(), journal=None):
+        with self._lock, self._conn:
+            cur = self._conn.execute(sql, params)
+            if journal is not None:
+                self._journal(*journal)
+            return cur
+
+    def _journal(self, kind, payload):
+        self._conn.execute(
+            "insert into outbox (kind, payload) values (?, ?)",
+            (kind, json.dumps(payload)),
+        )
+
+    # player
+    def get_or_create_player(self, username):
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "select playerid from players where playername = ?", (username,)
+            ).fetchone()
+            if row:
+                return row["playerid"]
+            return self._conn.execute(
+                "insert into players (playername) values (?)", (username,)
+            ).lastrowid
+
+    # game
+    def bootstrap_game(self, username, phraseid):
+        playerid = self.get_or_create_player(username)
+        bot_playerid = self.get_bot_playerid()
+        gameid = self.start_game(phraseid, playerid)
+        return gameid, playerid, bot_playerid, 0
+
+    def start_game(self, phraseid, playerid):
+        # lets a retried replay find the remote game instead of duplicating it
+        client_key = str(uuid.uuid4())
+        with self._lock, self._conn:
+            gameid = self._conn.execute(
+                "insert into games (phraseid, client_key) values (?, ?)", (phraseid, client_key)
+            ).lastrowid
+            self._conn.execute(
+                "insert into gameplayers (gameid, playerid, score) values (?, ?, 0)",
+                (gameid, playerid),
+            )
+            if phraseid is None:
+                # the "PYTHON" fallback game: nothing to join it to remotely,
+                # so it stays local (see _replay)
+                return gameid
+            self._journal("start_game", {
+                "gameid": gameid,
+                "playerid": playerid,
+                "phraseid": phraseid,
+                "client_key": client_key,
+            })
+        return gameid
+
+    def update(self, table, values, match):
+        if table not in ("games", "gameplayers", "players"):
+            raise ValueError(f"Unknown table: {table}")
+
+        sets = ", ".join(f"{k} = ?" for k in values)
+        where = " and ".join(f"{k} = ?" for k in match)
+        self._execute(
+            f"update {table} set {sets} where {where}",
+            tuple(values.values()) + tuple(match.values()),
+            journal=("update", {"table": table, "values": values, "match": match}),
+        )
+
+    # phrase
+    def get_random_phrase(self, difficulty="medium", exclude=("music",)):
+        choice = self.phrases.pick(difficulty, self._categories(exclude))
+        if choice:
+            return choice["phraseid"], choice["phrasetext"], choice.get("category", "")
+
+        # nothing local yet (first launch, before the first sync lands): ask
+        # Supabase directly, as SupabaseClient falls back to its RPC
+        if self.remote is not None:
+            try:
+                phraseid, text, category = self.remote.get_random_phrase(difficulty, exclude)
+            except Exception:
+                phraseid = text = category = None
+            if phraseid is not None:
+                row = {
+                    "phraseid": phraseid,
+                    "phrasetext": text,
+                    "category": category,
+                    "difficulty": (difficulty or "medium").strip().lower(),
+                }
+                # kept locally so the game joins its phrase on the leaderboard;
+                # the next sync fills in change_seq
+                self._execute(
+                    "insert or ignore into phrases (phraseid, phrasetext, category, difficulty) "
+                    "values (:phraseid, :phrasetext, :category, :difficulty)",
+                    row,
+                )
+                return phraseid, text, category
+        return None, None, None
+
+    def _pull_phrases(self, since):
+        if self.remote is None:
+            return []
+
+        rows = self.remote.fetch_phrases(since)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                # deleted phrases stay as tombstones: old games still join them.
+                # Rows re-read below the cursor are usually unchanged; skip those.
+                "insert into phrases (phraseid, phrasetext, category, difficulty, change_seq, deleted) "
+                "values (:phraseid, :phrasetext, :category, :difficulty, :change_seq, :deleted) "
+                "on conflict (phraseid) do update set "
+                "phrasetext = excluded.phrasetext, category = excluded.category, difficulty = excluded.difficulty, "
+                "change_seq = excluded.change_seq, deleted = excluded.deleted "
+                "where phrases.change_seq is not excluded.change_seq or phrases.deleted != excluded.deleted",
+                [{"change_seq": None, **r, "deleted": int(bool(r.get("deleted")))} for r in rows],
+            )
+            if since is None and rows:
+                # a full fetch: anything it did not return was deleted remotely
+                self._conn.execute("create temp table if not exists fetched (phraseid integer primary key)")
+                self._conn.execute("delete from fetched")
+                self._conn.executemany("insert or ignore into fetched values (?)", [(r["phraseid"],) for r in rows])
+                self._conn.execute("update phrases set deleted = 1 where phraseid not in (select phraseid from fetched)")
+        return rows
+
+    # guesses
+    def record_guess(self, gameid, playerid, letter, correct):
+        return self.record_guesses([{
+            "gameid": gameid,
+            "playerid": playerid,
+            "guessedletter": letter,
+            "correct": correct,
+        }])
+
+    def record_guesses(self, rows):
+        if not rows:
+            return None
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "insert into guesses (gameid, playerid, guessedletter, correct) "
+                "values (:gameid, :playerid, :guessedletter, :correct)",
+                rows,
+            )
+            self._journal("guesses", {"rows": rows})
+
+    def get_score(self, gameid, playerid):
+        rows = self._query(
+            "select score from gameplayers where gameid = ? and playerid = ?", (gameid, playerid)
+        )
+        return rows[0]["score"] if rows else 0
+
+    def increment_score(self, gameid, playerid):
+        return self._execute(
+            "update gameplayers set score = score + 1 where gameid = ? and playerid = ?",
+            (gameid, playerid),
+            journal=("increment_score", {"gameid": gameid, "playerid": playerid}),
+        )
+
+    # leaderboard
+    def get_leaderboard(self, difficulty, limit=10, after=None):
+        if self.remote is not None:
+            try:
+                return self.remote.get_leaderboard(difficulty, limit, after)
+            except Exception:
+                pass
+
+        difficulty = (difficulty or "").strip().lower()
+        if after is None:
+            return self._query(
+                "select * from leaderboard where difficulty = ? "
+                "order by total_score desc, playername limit ?",
+                (difficulty, limit),
+            )
+
+        score, name = after
+        return self._query(
+            "select * from leaderboard where difficulty = ? "
+            "and (total_score < ? or (total_score = ? and playername > ?)) "
+            "order by total_score desc, playername limit ?",
+            (difficulty, score, score, name, limit),
+        )
+
+    # sync
+    def _remote_player(self, playerid):
+        row = self._query("select playername, remote_id from players where playerid = ?", (playerid,))
+        if not row:
+            return None
+        if row[0]["remote_id"] is None:
+            remote_id = self.remote.get_or_create_player(row[0]["playername"])
+            self._execute("update players set remote_id = ? where playerid = ?", (remote_id, playerid))
+            return remote_id
+        return row[0]["remote_id"]
+
+    def _remote_game(self, gameid):
+        row = self._query("select remote_id from games where gameid = ?", (gameid,))
+        return row[0]["remote_id"] if row else None
+
+    def _remote_match(self, match):
+        mapped = dict(match)
+        if "gameid" in mapped:
+            mapped["gameid"] = self._remote_game(mapped["gameid"])
+        if "playerid" in mapped:
+            mapped["playerid"] = self._remote_player(mapped["playerid"])
+        return mapped
+
+    def _local_only(self, gameid):
+        row = self._query("select phraseid from games where gameid = ?", (gameid,))
+        return bool(row) and row[0]["phraseid"] is None
+
+    def _replay(self, kind, payload):
+        remote = self.remote
+
+        if kind == "guesses":
+            gameid = payload["rows"][0]["gameid"] if payload["rows"] else None
+        elif kind == "update":
+            gameid = payload["match"].get("gameid")
+        else:
+            gameid = payload.get("gameid")
+        if gameid is not None and self._local_only(gameid):
+            # writes for a game that was never sent (no phrase) are dropped
+            return
+
+        if kind == "start_game":
+            name = self._query("select playername from players where playerid = ?", (payload["playerid"],))
+            gameid, playerid, _, _ = remote.bootstrap_game(
+                name[0]["playername"], payload["phraseid"], client_key=payload.get("client_key")
+            )
+            self._execute("update games set remote_id = ? where gameid = ?", (gameid, payload["gameid"]))
+            self._execute("update players set remote_id = ? where playerid = ?", (playerid, payload["playerid"]))
+        elif kind == "guesses":
+            remote.record_guesses([{**r, **self._remote_match(r)} for r in payload["rows"]])
+        elif kind == "update":
+            remote.update(payload["table"], payload["values"], self._remote_match(payload["match"]))
+        elif kind == "increment_score":
+            m = self._remote_match(payload)
+            # must raise on failure: reconcile_score only checks the local
+            # score, so a lost remote increment would never be corrected
+            remote.increment_score(m["gameid"], m["playerid"], raise_errors=True)
+
+    def sync(self):
+        """Push journaled writes to the remote, oldest first.
+
+        A failing row stops the pass and is retried next time; after
+        MAX_SYNC_ATTEMPTS failures it is parked (kept, but skipped) so later
+        rows can go through. Nothing is pushed while Supabase is unreachable.
+        """
+        if self.remote is None:
+            return 0
+
+        try:
+            self.phrases.refresh()
+        except Exception:
+            # the phrase pull doubles as a reachability check: failures now
+            # would be the network, not the rows, so don't count them
+            return 0
+
+        sent = 0
+        for entry in self._query("select id, kind, payload, attempts from outbox where parked = 0 order by id"):
+            try:
+                self._replay(entry["kind"], json.loads(entry["payload"]))
+            except Exception as e:
+                attempts = entry["attempts"] + 1
+                parked = attempts >= MAX_SYNC_ATTEMPTS
+                self._execute(
+                    "update outbox set attempts = ?, parked = ?, last_error = ? where id = ?",
+                    (attempts, int(parked), repr(e)[:500], entry["id"]),
+                )
+                if parked:
+                    continue
+                break
+            self._execute("delete from outbox where id = ?", (entry["id"],))
+            sent += 1
+        return sent
+
+    def request_sync(self, then=None):
+        """Sync now rather than at the next interval, then call `then`.
+
+        `then` runs on the sync thread after a sync pass that started after
+        this call, so it sees everything journaled before it.
+        """
+        if self._sync_thread is None:
+            if then is not None:
+                then()
+            return
+        if then is not None:
+            with self._lock:
+                self._after_sync.append(then)
+        self._wake.set()
+
+    def _sync_loop(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            with self._lock:
+                callbacks, self._after_sync = self._after_sync, []
+            self.sync()
+            for then in callbacks:
+                try:
+                    then()
+                except Exception:
+                    pass
+            self._wake.wait(SYNC_SECONDS)
+
+    def connect(self):
+        if self.remote is not None:
+            self.remote.connect()
+        self.start_sync()
+
+    def start_sync(self):
+        if self.remote is None or self._sync_thread is not None:
+            return
+        self._sync_thread = threading.Thread(target=self._sync_loop, name="local-sync", daemon=True)
+        self._sync_thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
@@ -1,13 +1,27 @@
 import tkinter as tk
-from PIL import Image, ImageTk
 import os
+import threading
 import pygame
 
-from supabase_client import db
+from supabase_client import db, leaderboards, writes
+from game_engine import phrase_difficulty
 from gameboard import HangmanGame
+from image_store import images
+from leaderboard_cache import LEADERBOARD_PAGE_SIZE
+from leaderboard_table import LeaderboardTable
+
+BG_RESIZE_DEBOUNCE_MS = 120
 
 
 class AudioManager:
+    """Background music streamed through pygame.mixer.music, SFX decoded lazily.
+
+    Nothing touches the mixer until `start()`, which initializes it on a
+    background thread and then preloads the short effects.
+    """
+
+    SFX_NAMES = ("good", "win", "lost")
+
     def __init__(self, base_dir: str):
         self.base_dir = base_dir
         self.sounds_dir = os.path.join(self.base_dir, "sounds")
@@ -21,46 +35,83 @@ class AudioManager:
 
         self.audio_ok = False
         self.sfx = {}
+        self._sfx_lock = threading.Lock()
+        # the init thread and the Tk thread both start and stop the music;
+        # _want_duel, audio_ok and mixer.music are only touched under this
+        self._music_lock = threading.Lock()
+        self._started = False
+        self._want_duel = False
+        self._duel_loaded = False
+
+    def start(self):
+        if self._started:
+            return
+        self._started = True
+        threading.Thread(target=self._init_mixer, name="audio-init", daemon=True).start()
 
+    def _init_mixer(self):
         try:
             if not pygame.mixer.get_init():
                 pygame.mixer.init()
-
-            self.ch_duel = pygame.mixer.Channel(0)
             self.ch_sfx = pygame.mixer.Channel(1)
+        except Exception:
+            self.audio_ok = False
+            return
 
-            for name, path in self.sound_paths.items():
-                if os.path.exists(path):
+        with self._music_lock:
+            self.audio_ok = True
+            if self._want_duel:
+                self._play_duel_locked()
+
+        for name in self.SFX_NAMES:
+            self._get_sfx(name)
+
+    def _get_sfx(self, name):
+        with self._sfx_lock:
+            if name not in self.sfx:
+                path = self.sound_paths.get(name)
+                snd = None
+                if path and os.path.exists(path):
                     try:
-                        self.sfx[name] = pygame.mixer.Sound(path)
+                        snd = pygame.mixer.Sound(path)
                     except Exception:
-                        pass
-
-            self.audio_ok = True
-        except Exception:
-            self.audio_ok = False
+                        snd = None
+                self.sfx[name] = snd
+            return self.sfx[name]
 
     def play_duel_loop(self):
-        if not self.audio_ok:
-            return
-        snd = self.sfx.get("duel")
-        if not snd:
-            return
-        if not self.ch_duel.get_busy():
-            self.ch_duel.play(snd, loops=-1)
+        with self._music_lock:
+            self._want_duel = True
+            if self.audio_ok:
+                self._play_duel_locked()
 
-    def stop_duel(self):
-        if not self.audio_ok:
-            return
+    def _play_duel_locked(self):
         try:
-            self.ch_duel.stop()
+            if not self._duel_loaded:
+                path = self.sound_paths["duel"]
+                if not os.path.exists(path):
+                    return
+                pygame.mixer.music.load(path)
+                self._duel_loaded = True
+            if not pygame.mixer.music.get_busy():
+                pygame.mixer.music.play(loops=-1)
         except Exception:
             pass
 
+    def stop_duel(self):
+        with self._music_lock:
+            self._want_duel = False
+            if not self.audio_ok:
+                return
+            try:
+                pygame.mixer.music.stop()
+            except Exception:
+                pass
+
     def play_good(self):
         if not self.audio_ok:
             return
-        snd = self.sfx.get("good")
+        snd = self._get_sfx("good")
         if snd:
             self.ch_sfx.play(snd)
 
@@ -68,7 +119,7 @@ class AudioManager:
         if not self.audio_ok:
             return
         self.stop_duel()
-        snd = self.sfx.get("win")
+        snd = self._get_sfx("win")
         if snd:
             self.ch_sfx.play(snd)
 
@@ -76,7 +127,7 @@ class AudioManager:
         if not self.audio_ok:
             return
         self.stop_duel()
-        snd = self.sfx.get("lost")
+        snd = self._get_sfx("lost")
         if snd:
             self.ch_sfx.play(snd)
 
@@ -108,21 +159,33 @@ class HangmanApp(tk.Tk):
         self.audio = AudioManager(base_dir=os.path.dirname(__file__))
         self.audio.play_duel_loop()
 
-        self._bg_original = None
+        self._bg_path = None
+        self._bg_size = None
         self._bg_img = None
         self._bg_label = None
+        self._bg_after_id = None
 
         self.username = None
         self.difficulty_var = tk.StringVar(value="medium")
 
+        self._screens = {}
+        self._difficulty_buttons = {}
+        self._rules_welcome_var = tk.StringVar()
+        self._difficulty_welcome_var = tk.StringVar()
+
         self.protocol("WM_DELETE_WINDOW", self._on_close)
         self.show_login()
 
+        # build the backend client and the mixer once the login screen is up
+        self.after(50, db.connect)
+        self.after(50, self.audio.start)
+
     def _on_close(self):
         try:
             self.audio.shutdown()
         except Exception:
             pass
+        writes.close()
         self.destroy()
 
     # bg auto resize
@@ -131,37 +194,85 @@ class HangmanApp(tk.Tk):
             self._bg_label = tk.Label(self, bd=0, highlightthickness=0)
             self._bg_label.place(x=0, y=0, relwidth=1, relheight=1)
 
-        try:
-            self._bg_original = Image.open(img_path)
-        except Exception:
-            self._bg_original = None
-            self._bg_label.configure(image="")
-            return
+        self._bg_path = img_path
+        self._bg_size = None
+        self.bind("<Configure>", self._on_configure)
+        self._render_background()
 
-        self.bind("<Configure>", self._resize_background)
-        self._resize_background(None)
+    def _bg_target_size(self):
+        return max(400, self.winfo_width()), max(300, self.winfo_height())
 
-    def _resize_background(self, event):
-        if not self._bg_original or not self._bg_label:
+    def _on_configure(self, event):
+        # child widgets report <Configure> through the toplevel binding too
+        if event.widget is not self or not self._bg_path or not self._bg_label:
             return
 
-        w = max(400, self.winfo_width())
-        h = max(300, self.winfo_height())
+        size = self._bg_target_size()
+        if size == self._bg_size:
+            return
 
+        if self._bg_after_id is not None:
+            self.after_cancel(self._bg_after_id)
+        self._bg_after_id = self.after(BG_RESIZE_DEBOUNCE_MS, self._render_background)
+
+        # cheap stand-in until the size settles
         try:
-            resized = self._bg_original.resize((w, h), Image.LANCZOS)
-            self._bg_img = ImageTk.PhotoImage(resized)
-            self._bg_label.configure(image=self._bg_img)
-            self._bg_label.lower()
+            img = images.cached_photo(self._bg_path, size) or images.preview_photo(self._bg_path, size)
+            if img is not None:
+                self._show_background(img, size)
         except Exception:
             pass
 
+    def _render_background(self):
+        self._bg_after_id = None
+        if not self._bg_path or not self._bg_label:
+            return
+
+        path = self._bg_path
+        size = self._bg_target_size()
+
+        def ready(img):
+            # a newer screen or size has taken over
+            if path != self._bg_path or size != self._bg_target_size():
+                return
+            if img is None:
+                self._bg_label.configure(image="")
+                return
+            self._show_background(img, size)
+
+        images.request_photo(self, path, size, ready)
+
+    def _show_background(self, img, size):
+        self._bg_img = img
+        self._bg_size = size
+        self._bg_label.configure(image=img)
+        self._bg_label.lower()
+
     def clear_window(self):
+        persistent = set(self._screens.values())
         for widget in self.winfo_children():
             if widget is self._bg_label:
                 continue
+            if widget in persistent:
+                widget.place_forget()
+                continue
             widget.destroy()
 
+    # static screens are built once, then hidden and shown again
+    def _show_screen(self, name, build):
+        self.clear_window()
+        screen = self._screens.get(name)
+        if screen is None:
+            screen = build()
+            self._screens[name] = screen
+        screen.place(relx=0.5, rely=0.5, anchor="center")
+        return screen
+
+    def _set_username(self, username):
+        self.username = username
+        self._rules_welcome_var.set(f"Welcome, {username}.")
+        self._difficulty_welcome_var.set(f"Welcome {username}")
+
     # UI helper code
     def _make_overlay_card(self, parent, bg="#b7956b", pad=18):
         card = tk.Frame(parent, bg=bg, bd=0, highlightthickness=0)
@@ -211,11 +322,18 @@ class HangmanApp(tk.Tk):
 
     # login
     def show_login(self):
-        self.clear_window()
+        self._show_screen("login", self._build_login)
         self.set_screen_background(os.path.join("images", "background.png"))
+        self.username_entry.delete(0, tk.END)
 
+        try:
+            self.audio.stop_sfx()
+            self.audio.play_duel_loop()
+        except Exception:
+            pass
+
+    def _build_login(self):
         frame = tk.Frame(self, bg="#d2af80", bd=2, highlightthickness=0)
-        frame.place(relx=0.5, rely=0.5, anchor="center")
 
         tk.Label(
             frame,
@@ -234,24 +352,27 @@ class HangmanApp(tk.Tk):
             command=self.login
         ).pack(pady=20)
 
-        try:
-            self.audio.stop_sfx()
-            self.audio.play_duel_loop()
-        except Exception:
-            pass
+        return frame
 
     def login(self):
         username = self.username_entry.get().strip()
         if not username:
             return
-        self.username = username
         self.show_rules(username)
 
     # rules
     def show_rules(self, username):
-        self.clear_window()
+        self._set_username(username)
+        self._show_screen("rules", self._build_rules)
         self.set_screen_background(os.path.join("images", "bgPlay.jpg"))
 
+        try:
+            self.audio.stop_sfx()
+            self.audio.play_duel_loop()
+        except Exception:
+            pass
+
+    def _build_rules(self):
         card, inner = self._make_overlay_card(self, bg="#b7956b", pad=18)
 
         tk.Label(
@@ -275,7 +396,7 @@ class HangmanApp(tk.Tk):
 
         tk.Label(
             content,
-            text=f"Welcome, {username}.",
+            textvariable=self._rules_welcome_var,
             font=("Castellar", 18, "bold"),
             bg="#b7956b",
             fg="black"
@@ -298,6 +419,7 @@ class HangmanApp(tk.Tk):
             "Easy: the villain plays sloppy.",
             "Medium: the villain plays half-smart.",
             "Hard: the villain aims for the most likely letters.",
+            "Hard+: the villain knows the phrase book and narrows it down as it goes.",
         ]
 
         for line in rules_text:
@@ -341,26 +463,41 @@ class HangmanApp(tk.Tk):
             fg="white",
             bd=0,
             width=12,
-            command=lambda: self.show_difficulty(username)
+            command=lambda: self.show_difficulty(self.username)
         ).grid(row=0, column=1, padx=8)
 
+        return card
+
+    # difficulty
+    def show_difficulty(self, username):
+        self._set_username(username)
+        self._show_screen("difficulty", self._build_difficulty)
+        self.set_screen_background(os.path.join("images", "bgPlay.jpg"))
+        self._select_difficulty("medium")
+
         try:
             self.audio.stop_sfx()
             self.audio.play_duel_loop()
         except Exception:
             pass
 
-    # difficulty
-    def show_difficulty(self, username):
-        self.clear_window()
-        self.set_screen_background(os.path.join("images", "bgPlay.jpg"))
+    def _select_difficulty(self, value):
+        self.difficulty_var.set(value)
+        if value == "hard+":
+            # start building the bot's phrase index before the game needs it
+            try:
+                db.phrase_index(phrase_difficulty(value))
+            except Exception:
+                pass
+        for key, b in self._difficulty_buttons.items():
+            b.configure(bg="#b95f1f" if key == value else "#e8d6b0")
 
+    def _build_difficulty(self):
         container = tk.Frame(self, bg="#b7956b", bd=0, highlightthickness=0)
-        container.place(relx=0.5, rely=0.5, anchor="center")
 
         tk.Label(
             container,
-            text=f"Welcome {username}",
+            textvariable=self._difficulty_welcome_var,
             font=("Castellar", 26, "bold"),
             bg="#b7956b",
             fg="black"
@@ -374,14 +511,7 @@ class HangmanApp(tk.Tk):
             fg="black"
         ).pack(pady=(0, 20))
 
-        self.difficulty_var = tk.StringVar(value="medium")
-        buttons = {}
-
-        def select(value, btn):
-            self.difficulty_var.set(value)
-            for b in buttons.values():
-                b.configure(bg="#e8d6b0")
-            btn.configure(bg="#b95f1f")
+        buttons = self._difficulty_buttons
 
         def make_diff_button(label, value):
             btn = tk.Button(
@@ -393,7 +523,7 @@ class HangmanApp(tk.Tk):
                 relief="flat",
                 bg="#e8d6b0",
                 activebackground="#b95f1f",
-                command=lambda: select(value, btn)
+                command=lambda: self._select_difficulty(value)
             )
             btn.pack(pady=6)
             return btn
@@ -401,7 +531,7 @@ class HangmanApp(tk.Tk):
         buttons["easy"] = make_diff_button("Easy", "easy")
         buttons["medium"] = make_diff_button("Medium", "medium")
         buttons["hard"] = make_diff_button("Hard", "hard")
-        select("medium", buttons["medium"])
+        buttons["hard+"] = make_diff_button("Hard+", "hard+")
 
         tk.Button(
             container,
@@ -411,7 +541,7 @@ class HangmanApp(tk.Tk):
             fg="white",
             bd=0,
             width=16,
-            command=lambda: self.start_game(username, self.difficulty_var.get()),
+            command=lambda: self.start_game(self.username, self.difficulty_var.get()),
         ).pack(pady=(20, 10))
 
         tk.Button(
@@ -431,14 +561,10 @@ class HangmanApp(tk.Tk):
             bg="#d9c9a3",
             bd=0,
             width=16,
-            command=lambda: self.show_rules(username),
+            command=lambda: self.show_rules(self.username),
         ).pack(pady=(10, 20))
 
-        try:
-            self.audio.stop_sfx()
-            self.audio.play_duel_loop()
-        except Exception:
-            pass
+        return container
 
     def start_game(self, username, difficulty):
         self.clear_window()
@@ -447,6 +573,8 @@ class HangmanApp(tk.Tk):
 
     # leaderboard
     def show_leaderboard(self, difficulty):
+        # hard+ games are played on, and ranked with, the hard phrases
+        difficulty = phrase_difficulty(difficulty)
         self.clear_window()
         self.set_screen_background(os.path.join("images", "bgPlay.jpg"))
 
@@ -460,39 +588,13 @@ class HangmanApp(tk.Tk):
             bg="#b7956b",
         ).pack(pady=(20, 10))
 
-        lb = db.get_leaderboard(difficulty)
-        if not lb:
-            tk.Label(
-                frame,
-                text="No leaderboard data available.",
-                font=("Castellar", 16),
-                bg="#b7956b"
-            ).pack(pady=10)
-        else:
-            table = tk.Frame(frame, bg="white", bd=1, relief="solid")
-            table.pack(padx=30, pady=10)
+        body = tk.Frame(frame, bg="#b7956b", bd=0, highlightthickness=0)
+        body.pack()
 
-            headers = ["Rank", "Player", "Score", "Games Played"]
-            for col, text in enumerate(headers):
-                tk.Label(
-                    table,
-                    text=text,
-                    font=("Castellar", 12, "bold"),
-                    bg="#e0e0e0",
-                    width=18,
-                    relief="ridge",
-                    borderwidth=1,
-                ).grid(row=0, column=col, sticky="nsew")
-
-            for row, entry in enumerate(lb, start=1):
-                tk.Label(table, text=row, font=("Castellar", 12),
-                         width=6, relief="ridge", borderwidth=1).grid(row=row, column=0, sticky="nsew")
-                tk.Label(table, text=entry["playername"], font=("Castellar", 12),
-                         width=18, relief="ridge", borderwidth=1).grid(row=row, column=1, sticky="nsew")
-                tk.Label(table, text=entry["total_score"], font=("Castellar", 12),
-                         width=10, relief="ridge", borderwidth=1).grid(row=row, column=2, sticky="nsew")
-                tk.Label(table, text=entry["games_played"], font=("Castellar", 12),
-                         width=12, relief="ridge", borderwidth=1).grid(row=row, column=3, sticky="nsew")
+        lb, pending = leaderboards.get(difficulty)
+        self._render_leaderboard(body, difficulty, lb, loading=pending is not None)
+        if pending is not None:
+            self._await_leaderboard(body, difficulty, pending, stale=lb)
 
         tk.Button(
             frame,
@@ -510,6 +612,42 @@ class HangmanApp(tk.Tk):
         except Exception:
             pass
 
+    def _await_leaderboard(self, body, difficulty, pending, stale=None):
+        if not body.winfo_exists():
+            return
+        if not pending.done():
+            self.after(100, lambda: self._await_leaderboard(body, difficulty, pending, stale))
+            return
+
+        try:
+            lb = pending.result()
+        except Exception:
+            lb = stale
+        self._render_leaderboard(body, difficulty, lb, loading=False)
+
+    def _render_leaderboard(self, body, difficulty, lb, loading):
+        for widget in body.winfo_children():
+            widget.destroy()
+
+        if not lb:
+            tk.Label(
+                body,
+                text="Loading leaderboard..." if loading else "No leaderboard data available.",
+                font=("Castellar", 16),
+                bg="#b7956b"
+            ).pack(pady=10)
+            return
+
+        def fetch_more(last):
+            return db.get_leaderboard(difficulty, LEADERBOARD_PAGE_SIZE, after=(last["total_score"], last["playername"]))
+
+        LeaderboardTable(
+            body,
+            lb,
+            fetch_more=fetch_more,
+            page_size=LEADERBOARD_PAGE_SIZE,
+        ).pack(padx=30, pady=10)
+
 
 if __name__ == "__main__":
     app = HangmanApp()
@@ -5,7 +5,7 @@ a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('images', 'images'), ('sounds', 'sounds'), ('character_offsets.json', '.')],
+    datas=[('images', 'images'), ('sounds', 'sounds'), ('character_offsets.json', '.'), ('character_manifest.json', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -0,0 +1,233 @@
+import json
+import os
+import random
+import threading
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".hangversus")
+CACHE_PATH = os.path.join(CACHE_DIR, "phrase_cache.json")
+
+REFRESH_SECONDS = 300
+
+# deltas re-read this many sequence numbers below the cursor, to catch
+# changes that committed after later-numbered ones were already fetched
+SEQ_OVERLAP = 1000
+
+
+def _norm(value) -> str:
+    return (value or "").strip().lower()
+
+
+class PhraseCache:
+    """In-memory phrase index keyed by (difficulty, category), persisted to disk.
+
+    `fetch_rows(since)` is called from a background thread and must return the
+    phrase rows with change_seq > `since` (all rows when `since` is None).
+    Rows may repeat; rows flagged `deleted` are dropped from the cache.
+    With `path=None` nothing is read from or written to disk.
+    """
+
+    def __init__(self, fetch_rows, path=CACHE_PATH, refresh_seconds=REFRESH_SECONDS):
+        self._fetch_rows = fetch_rows
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._index = {}
+        self.cursor = None
+
+        # hard+ candidate indexes: pool key -> (generation, PhraseIndex)
+        self._generation = 0
+        self._phrase_indexes = {}
+        self._building = set()
+
+        self._stop = threading.Event()
+        self._thread = None
+
+    # index
+    def _rebuild_index(self):
+        index = {}
+        for row in self._rows.values():
+            key = (_norm(row.get("difficulty")), _norm(row.get("category")))
+            index.setdefault(key, []).append(row)
+        self._index = index
+
+    def _merge(self, rows):
+        # rows re-read below the cursor mostly come back unchanged; only a
+        # new phrase or a new change_seq / deleted flag rebuilds anything
+        changed = False
+        for row in rows:
+            phraseid = row.get("phraseid")
+            if phraseid is None:
+                continue
+            cached = self._rows.get(phraseid)
+            if row.get("deleted"):
+                if cached is not None:
+                    del self._rows[phraseid]
+                    changed = True
+            elif cached is None or cached.get("change_seq") != row.get("change_seq"):
+                self._rows[phraseid] = row
+                changed = True
+            seq = row.get("change_seq")
+            if seq is not None and (self.cursor is None or seq > self.cursor):
+                self.cursor = seq
+        if changed:
+            self._rebuild_index()
+            self._generation += 1
+        return changed
+
+    def add_rows(self, rows, complete=False):
+        """Merge `rows`; with `complete`, they are the whole table and any
+        cached phrase missing from them is dropped. Returns whether the
+        cached phrases changed."""
+        with self._lock:
+            if complete:
+                dropped, self._rows = bool(self._rows), {}
+                changed = self._merge(rows)
+                if dropped and not changed:
+                    # every cached phrase is gone and nothing replaced them
+                    self._rebuild_index()
+                    self._generation += 1
+                    changed = True
+            else:
+                changed = self._merge(rows)
+            stale = list(self._phrase_indexes) if changed else []
+        # keep indexes that have been asked for current
+        for key in stale:
+            self._start_index_build(key)
+        return changed
+
+    def pick(self, difficulty, categories):
+        difficulty = _norm(difficulty)
+        with self._lock:
+            buckets = [self._index.get((difficulty, _norm(c)), ()) for c in categories]
+        total = sum(len(b) for b in buckets)
+        if not total:
+            return None
+
+        i = random.randrange(total)
+        for bucket in buckets:
+            if i < len(bucket):
+                return bucket[i]
+            i -= len(bucket)
+        return None
+
+    # hard+ candidate index
+    def phrase_index(self, difficulty, categories):
+        """The bot_player.PhraseIndex over the (difficulty, categories) pool.
+
+        Built on a background thread; returns the last built index (None the
+        first time) and starts a rebuild when the phrases have changed.
+        """
+        key = (_norm(difficulty), tuple(sorted({_norm(c) for c in categories})))
+        with self._lock:
+            entry = self._phrase_indexes.get(key)
+            current = entry is not None and entry[0] == self._generation
+        if not current:
+            self._start_index_build(key)
+        return entry[1] if entry else None
+
+    def _start_index_build(self, key):
+        with self._lock:
+            if key in self._building:
+                return
+            self._building.add(key)
+        threading.Thread(target=self._build_phrase_index, args=(key,), name="phrase-index", daemon=True).start()
+
+    def _build_phrase_index(self, key):
+        # imported here: bot_player is only needed once hard+ is in play
+        from bot_player import PhraseIndex
+
+        difficulty, categories = key
+        built = False
+        try:
+            with self._lock:
+                generation = self._generation
+                texts = [
+                    row["phrasetext"]
+                    for c in categories
+                    for row in self._index.get((difficulty, c), ())
+                    if row.get("phrasetext")
+                ]
+            index = PhraseIndex(texts)
+            with self._lock:
+                entry = self._phrase_indexes.get(key)
+                if entry is None or entry[0] < generation:
+                    self._phrase_indexes[key] = (generation, index)
+            built = True
+        except Exception:
+            # hard+ keeps playing on the frequency bands without an index
+            pass
+        finally:
+            with self._lock:
+                self._building.discard(key)
+                # phrases changed mid-build: go again. A failed build is not
+                # retried here; the next phrase_index() call asks again
+                stale = built and generation != self._generation
+            if stale:
+                self._start_index_build(key)
+
+    def __len__(self):
+        return len(self._rows)
+
+    # disk
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict):
+            return
+
+        with self._lock:
+            # files from before change_seq carry no cursor: full fetch
+            self.cursor = data.get("cursor")
+            self._merge(data.get("rows") or [])
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {"cursor": self.cursor, "rows": list(self._rows.values())}
+
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    # refresh
+    def refresh(self):
+        since = None if self.cursor is None else max(0, self.cursor - SEQ_OVERLAP)
+        rows = self._fetch_rows(since)
+        if not rows:
+            return False
+
+        if not self.add_rows(rows, complete=since is None):
+            return False
+        self.save()
+        return True
+
+    def _refresh_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception:
+                pass
+            self._stop.wait(self.refresh_seconds)
+
+    def start_refresh(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._refresh_loop, name="phrase-cache", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
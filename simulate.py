@@ -0,0 +1,236 @@
+"""Play seeded headless duels to see how the bot difficulties actually land.
+
+    python simulate.py --games 200000
+    python simulate.py --phrases phrases.json --difficulty hard \
+        --sweep correct_chance=0.55,0.65,0.75 --sweep phrase_base=0.2,0.3
+
+Phrases come from the local store (~/.hangversus/hangversus.sqlite3) unless
+--phrases points at a JSON list of strings or of {"phrasetext", "difficulty"}
+rows.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sqlite3
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from bot_player import BotPlayer, PhraseIndex
+from game_engine import BOT_TUNING, CALLED, HANGED, SOLVED, GameEngine, bot_tuning, phrase_difficulty
+from letter_mask import ALL_LETTERS, BIT, nth_letter
+from local_store import DB_PATH, LocalStore
+
+CHUNK = 2000
+
+FREQ_BITS = tuple((letter, BIT[letter]) for letter in BotPlayer.FREQ_ORDER)
+
+
+# corpus
+def load_corpus(path=None):
+    """{difficulty: [phrase, ...]} from a JSON file or the local store."""
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        rows = [r if isinstance(r, dict) else {"phrasetext": r} for r in rows]
+    else:
+        if not os.path.exists(DB_PATH):
+            raise FileNotFoundError(f"No local store at {DB_PATH}; run the game once or pass --phrases")
+        conn = sqlite3.connect(DB_PATH)
+        conn.row_factory = sqlite3.Row
+        try:
+            # deleted phrases are kept as tombstones; the game never picks them
+            rows = [dict(r) for r in conn.execute("select phrasetext, category, difficulty from phrases where deleted = 0")]
+        finally:
+            conn.close()
+        allowed = set(LocalStore.ALLOWED_CATEGORIES)
+        rows = [r for r in rows if (r.get("category") or "").strip().lower() in allowed]
+
+    corpus = {}
+    for r in rows:
+        text = (r.get("phrasetext") or "").upper().strip()
+        if not text or r.get("deleted"):
+            continue
+        difficulty = (r.get("difficulty") or "").strip().lower()
+        if difficulty:
+            corpus.setdefault(difficulty, []).append(text)
+        else:
+            # untagged phrases are fair game at every level
+            for d in {phrase_difficulty(d) for d in BOT_TUNING}:
+                corpus.setdefault(d, []).append(text)
+    return corpus
+
+
+# simulated player
+class SimPlayer:
+    """A stand-in for a human: mostly frequency-ordered guesses, the odd
+    hunch, and calling the phrase once most of it is showing."""
+
+    def __init__(self, rng, skill=0.7, call_at=0.75):
+        self.rng = rng
+        self.skill = skill
+        self.call_at = call_at
+
+    def act(self, engine):
+        s = engine.state
+        if s.letters and (s.letters & s.guessed).bit_count() / s.letter_count >= self.call_at:
+            return engine.guess_phrase(s.word)
+
+        left = ALL_LETTERS & ~s.tried
+        if self.rng.random() < self.skill:
+            for letter, bit in FREQ_BITS:
+                if bit & left:
+                    break
+        else:
+            letter = nth_letter(left, int(self.rng.random() * left.bit_count()))
+        return engine.guess_letter(letter)
+
+    def bonus(self, engine):
+        return "take" if engine.state.wrong > 0 else "add"
+
+
+def play(engine, player, phrases, rng):
+    """One game on a reused engine. Returns (winner, ending, turns)."""
+    engine.new_game(rng.choice(phrases))
+    s = engine.state
+
+    turns = 0
+    while not s.over:
+        turns += 1
+        if s.turn == "bot":
+            engine.bot_step()
+            continue
+        player.act(engine)
+        if s.pending_bonus:
+            engine.choose_bonus(player.bonus(engine))
+    return s.winner, s.ending, turns
+
+
+# workers
+_corpus = {}
+
+
+def _init_worker(corpus):
+    # ship the corpus once per worker rather than with every chunk
+    global _corpus
+    _corpus = corpus
+
+
+def run_chunk(job):
+    key, difficulty, tuning, first_seed, count, skill, call_at = job
+    phrases = _corpus[phrase_difficulty(difficulty)]
+    index = None
+    if difficulty == "hard+":
+        # the same pool the game's phrase comes from, as in the app
+        index = PhraseIndex.for_corpus(phrases)
+
+    # one seeded rng and one engine per chunk: building them per game
+    # cost about as much as playing
+    rng = random.Random(first_seed)
+    engine = GameEngine(phrases[0], difficulty, rng=rng, tuning=tuning, index=index)
+    player = SimPlayer(rng, skill, call_at)
+
+    outcomes = Counter()
+    lengths = Counter()
+    for _ in range(count):
+        winner, ending, turns = play(engine, player, phrases, rng)
+        outcomes[(winner, ending)] += 1
+        lengths[turns] += 1
+    return key, outcomes, lengths
+
+
+def build_jobs(corpus, difficulties, sweeps, games, seed, skill, call_at):
+    names = [name for name, _ in sweeps]
+    grid = list(itertools.product(*[values for _, values in sweeps])) or [()]
+
+    jobs = []
+    for difficulty in difficulties:
+        if not corpus.get(phrase_difficulty(difficulty)):
+            print(f"skipping {difficulty}: no phrases")
+            continue
+        for values in grid:
+            overrides = dict(zip(names, values))
+            key = (difficulty, tuple(sorted(overrides.items())))
+            tuning = bot_tuning(difficulty, **overrides)
+            # same seeds for every config so sweeps compare like with like
+            for start in range(0, games, CHUNK):
+                count = min(CHUNK, games - start)
+                jobs.append((key, difficulty, tuning, seed + start, count, skill, call_at))
+    return jobs
+
+
+# report
+def _percentile(lengths, q):
+    total = sum(lengths.values())
+    want = q * total
+    seen = 0
+    for turns in sorted(lengths):
+        seen += lengths[turns]
+        if seen >= want:
+            return turns
+    return 0
+
+
+def report(results):
+    header = f"{'difficulty':<10} {'config':<40} {'games':>8} {'win%':>6} {'solve%':>7} {'call%':>6} {'bothang%':>8} {'botcall%':>8} {'mean':>6} {'p50':>4} {'p90':>4} {'p99':>4}"
+    print(header)
+    print("-" * len(header))
+    for (difficulty, overrides), (outcomes, lengths) in sorted(results.items()):
+        games = sum(outcomes.values())
+        pct = lambda n: 100.0 * n / games
+        wins = sum(n for (winner, _), n in outcomes.items() if winner == "player")
+        config = ",".join(f"{k}={v}" for k, v in overrides) or "default"
+        mean = sum(t * n for t, n in lengths.items()) / games
+        print(
+            f"{difficulty:<10} {config:<40} {games:>8} {pct(wins):>6.1f} "
+            f"{pct(outcomes[('player', SOLVED)]):>7.1f} {pct(outcomes[('player', CALLED)]):>6.1f} "
+            f"{pct(outcomes[('player', HANGED)]):>8.1f} {pct(outcomes[('bot', CALLED)]):>8.1f} "
+            f"{mean:>6.1f} {_percentile(lengths, 0.5):>4} {_percentile(lengths, 0.9):>4} {_percentile(lengths, 0.99):>4}"
+        )
+
+
+def _parse_sweep(text):
+    name, _, values = text.partition("=")
+    name = name.strip()
+    if name not in BOT_TUNING["medium"]:
+        raise argparse.ArgumentTypeError(f"unknown knob {name!r}; pick from {', '.join(BOT_TUNING['medium'])}")
+    try:
+        return name, [float(v) for v in values.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad values in {text!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate player-vs-bot duels.")
+    parser.add_argument("--games", type=int, default=100000, help="games per difficulty and config")
+    parser.add_argument("--difficulty", action="append", choices=sorted(BOT_TUNING), help="repeatable; default all")
+    parser.add_argument("--phrases", help="JSON phrase list instead of the local store")
+    parser.add_argument("--sweep", action="append", type=_parse_sweep, default=[], metavar="KNOB=V1,V2,...")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skill", type=float, default=0.7, help="odds the simulated player takes the most common letter left")
+    parser.add_argument("--call-at", type=float, default=0.75, help="share of letters revealed before the player calls the phrase")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus(args.phrases)
+    difficulties = args.difficulty or sorted(BOT_TUNING)
+    jobs = build_jobs(corpus, difficulties, args.sweep, args.games, args.seed, args.skill, args.call_at)
+
+    results = {}
+    started = time.time()
+    with Pool(args.workers, initializer=_init_worker, initargs=(corpus,)) as pool:
+        for key, outcomes, lengths in pool.imap_unordered(run_chunk, jobs):
+            total = results.setdefault(key, (Counter(), Counter()))
+            total[0].update(outcomes)
+            total[1].update(lengths)
+    elapsed = time.time() - started
+
+    report(results)
+    played = sum(sum(o.values()) for o, _ in results.values())
+    print(f"\n{played} games in {elapsed:.1f}s ({played / max(elapsed, 1e-9):.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
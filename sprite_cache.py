@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageTk
+
+import image_pipeline
+
+MAX_SPRITES = 128
+
+# written by build_assets.py
+ATLAS_DIR = os.path.join("images", "atlas")
+
+
+class SpriteCache:
+    """LRU of ready-to-draw PhotoImages keyed by (character, part, scale).
+
+    Shared across games; PhotoImages must be created on the Tk thread.
+    Parts are cropped from the category atlas when one was built for the
+    same scale, and decoded from their own PNG otherwise. `prefetch` does
+    that work on the image worker pool ahead of the first draw.
+    """
+
+    def __init__(self, max_items=MAX_SPRITES):
+        self.max_items = max_items
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._widths = {}
+        self._atlases = {}
+
+    def _atlas(self, category):
+        with self._lock:
+            if category not in self._atlases:
+                try:
+                    with open(os.path.join(ATLAS_DIR, f"{category}.json"), "r", encoding="utf-8") as f:
+                        table = json.load(f)
+                    with Image.open(os.path.join(ATLAS_DIR, table["image"])) as im:
+                        atlas = im.convert("RGBA")
+                    self._atlases[category] = (atlas, table["characters"])
+                except (OSError, ValueError, KeyError):
+                    self._atlases[category] = (None, {})
+            return self._atlases[category]
+
+    def _from_atlas(self, category, character, part, scale):
+        if not category:
+            return None
+        atlas, characters = self._atlas(category)
+        entry = characters.get(character)
+        if atlas is None or not entry or abs(entry["scale"] - scale) > 1e-6:
+            return None
+        rect = entry["parts"].get(part)
+        if not rect:
+            return None
+        x, y, w, h = rect
+        return atlas.crop((x, y, x + w, y + h))
+
+    def ref_width(self, path):
+        if path not in self._widths:
+            with Image.open(path) as im:
+                self._widths[path] = im.size[0]
+        return self._widths[path]
+
+    def _render(self, character, part, scale, path, category=None):
+        # safe to run on a worker thread
+        im = self._from_atlas(category, character, part, scale)
+        if im is None:
+            with Image.open(path) as src:
+                src = src.convert("RGBA")
+                w, h = src.size
+                im = src.resize((max(1, int(w * scale)), max(1, int(h * scale))), Image.LANCZOS)
+        return im
+
+    def _store(self, key, photo):
+        self._items[key] = photo
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def get(self, character, part, scale, path, category=None):
+        key = (character, part, round(scale, 4))
+        photo = self._items.get(key)
+        if photo is not None:
+            self._items.move_to_end(key)
+            return photo
+
+        photo = ImageTk.PhotoImage(self._render(character, part, scale, path, category))
+        self._store(key, photo)
+        return photo
+
+    def prefetch(self, widget, jobs):
+        """Render (character, part, scale, path, category) jobs in the background."""
+        for character, part, scale, path, category in jobs:
+            key = (character, part, round(scale, 4))
+            if key in self._items:
+                continue
+
+            def ready(im, key=key):
+                if im is not None and key not in self._items:
+                    self._store(key, ImageTk.PhotoImage(im))
+
+            future = image_pipeline.submit(self._render, character, part, scale, path, category)
+            image_pipeline.when_done(widget, future, ready)
+
+    def clear(self):
+        self._items.clear()
+        self._atlases.clear()
+
+
+sprites = SpriteCache()
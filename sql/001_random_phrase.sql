@@ -0,0 +1,50 @@
+-- Server-side random phrase selection.
+--
+-- Each phrase gets a precomputed random key plus normalized difficulty and
+-- category columns, so a random pick is a single index range scan instead of
+-- downloading the whole table.
+
+alter table phrases
+    add column if not exists rand_key double precision not null default random();
+
+alter table phrases
+    add column if not exists difficulty_norm text
+        generated always as (lower(btrim(coalesce(difficulty, '')))) stored;
+
+alter table phrases
+    add column if not exists category_norm text
+        generated always as (lower(btrim(coalesce(category, '')))) stored;
+
+create index if not exists phrases_pick_idx
+    on phrases (difficulty_norm, category_norm, rand_key);
+
+create or replace function random_phrase(p_difficulty text, p_categories text[])
+returns table (phraseid bigint, phrasetext text, category text, difficulty text)
+language plpgsql
+-- volatile: random() must be drawn on every call, not reused within a query
+volatile
+as $$
+declare
+    r double precision := random();
+begin
+    return query
+        select p.phraseid::bigint, p.phrasetext, p.category, p.difficulty
+        from phrases p
+        where p.difficulty_norm = lower(btrim(p_difficulty))
+          and p.category_norm = any (p_categories)
+          and p.rand_key >= r
+        order by p.rand_key
+        limit 1;
+
+    if not found then
+        -- wrap around to the start of the key range
+        return query
+            select p.phraseid::bigint, p.phrasetext, p.category, p.difficulty
+            from phrases p
+            where p.difficulty_norm = lower(btrim(p_difficulty))
+              and p.category_norm = any (p_categories)
+            order by p.rand_key
+            limit 1;
+    end if;
+end;
+$$;
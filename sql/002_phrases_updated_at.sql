@@ -0,0 +1,24 @@
+-- Change tracking for the client-side phrase cache.
+--
+-- Clients keep the newest updated_at they have seen and only fetch rows
+-- changed after it.
+
+alter table phrases
+    add column if not exists updated_at timestamptz not null default now();
+
+create index if not exists phrases_updated_at_idx on phrases (updated_at);
+
+create or replace function phrases_touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    return new;
+end;
+$$;
+
+drop trigger if exists phrases_touch_updated_at on phrases;
+create trigger phrases_touch_updated_at
+    before update on phrases
+    for each row execute function phrases_touch_updated_at();
@@ -0,0 +1,51 @@
+-- One round trip to start a game.
+--
+-- Resolves (or creates) the player, resolves the bot unless the client
+-- already knows its id, creates the games and gameplayers rows and returns
+-- everything the client needs, including the starting score.
+
+create or replace function start_game_session(
+    p_username text,
+    p_phraseid bigint,
+    p_bot_name text default 'Bot',
+    p_bot_playerid bigint default null
+)
+returns table (gameid bigint, playerid bigint, bot_playerid bigint, score integer)
+language plpgsql
+as $$
+declare
+    v_playerid bigint;
+    v_botid bigint := p_bot_playerid;
+    v_gameid bigint;
+begin
+    select p.playerid into v_playerid
+    from players p
+    where p.playername = p_username
+    limit 1;
+
+    if v_playerid is null then
+        insert into players (playername) values (p_username)
+        returning players.playerid into v_playerid;
+    end if;
+
+    if v_botid is null then
+        select p.playerid into v_botid
+        from players p
+        where p.playername = p_bot_name
+        limit 1;
+
+        if v_botid is null then
+            insert into players (playername) values (p_bot_name)
+            returning players.playerid into v_botid;
+        end if;
+    end if;
+
+    insert into games (phraseid) values (p_phraseid)
+    returning games.gameid into v_gameid;
+
+    insert into gameplayers (gameid, playerid, score)
+    values (v_gameid, v_playerid, 0);
+
+    return query select v_gameid, v_playerid, v_botid, 0;
+end;
+$$;
@@ -0,0 +1,77 @@
+-- Incrementally maintained leaderboard.
+--
+-- One row per (player, difficulty), updated when a game finishes and when a
+-- finished game's score is corrected afterwards, so reading the top N is an
+-- index scan instead of an aggregate over all of gameplayers.
+
+create table if not exists leaderboard_totals (
+    playerid bigint not null references players (playerid),
+    difficulty text not null,
+    playername text not null,
+    total_score bigint not null default 0,
+    games_played integer not null default 0,
+    primary key (playerid, difficulty)
+);
+
+create index if not exists leaderboard_totals_rank_idx
+    on leaderboard_totals (difficulty, total_score desc, playerid);
+
+create or replace function leaderboard_totals_add(
+    p_gameid bigint,
+    p_playerid bigint,
+    p_score bigint,
+    p_games integer
+)
+returns void
+language sql
+as $$
+    insert into leaderboard_totals (playerid, difficulty, playername, total_score, games_played)
+    select pl.playerid, ph.difficulty_norm, pl.playername, p_score, p_games
+    from games g
+    join phrases ph on ph.phraseid = g.phraseid
+    join players pl on pl.playerid = p_playerid
+    where g.gameid = p_gameid
+    on conflict (playerid, difficulty) do update
+        set total_score = leaderboard_totals.total_score + excluded.total_score,
+            games_played = leaderboard_totals.games_played + excluded.games_played,
+            playername = excluded.playername;
+$$;
+
+-- game finished: count every player's score once
+create or replace function leaderboard_totals_on_game()
+returns trigger
+language plpgsql
+as $$
+begin
+    if old.status is null and new.status is not null then
+        perform leaderboard_totals_add(gp.gameid, gp.playerid, gp.score, 1)
+        from gameplayers gp
+        where gp.gameid = new.gameid;
+    end if;
+    return new;
+end;
+$$;
+
+drop trigger if exists leaderboard_totals_on_game on games;
+create trigger leaderboard_totals_on_game
+    after update of status on games
+    for each row execute function leaderboard_totals_on_game();
+
+-- score changed on an already finished game: apply the difference
+create or replace function leaderboard_totals_on_score()
+returns trigger
+language plpgsql
+as $$
+begin
+    if new.score is distinct from old.score
+       and exists (select 1 from games g where g.gameid = new.gameid and g.status is not null) then
+        perform leaderboard_totals_add(new.gameid, new.playerid, new.score - old.score, 0);
+    end if;
+    return new;
+end;
+$$;
+
+drop trigger if exists leaderboard_totals_on_score on gameplayers;
+create trigger leaderboard_totals_on_score
+    after update of score on gameplayers
+    for each row execute function leaderboard_totals_on_score();
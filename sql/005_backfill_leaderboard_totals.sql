@@ -0,0 +1,21 @@
+-- Rebuild leaderboard_totals from game history.
+--
+-- Run once after 004_leaderboard_totals.sql, or any time the totals need to
+-- be recomputed from scratch.
+
+begin;
+
+lock table leaderboard_totals in exclusive mode;
+
+truncate leaderboard_totals;
+
+insert into leaderboard_totals (playerid, difficulty, playername, total_score, games_played)
+select pl.playerid, ph.difficulty_norm, pl.playername, sum(gp.score), count(*)
+from gameplayers gp
+join games g on g.gameid = gp.gameid
+join phrases ph on ph.phraseid = g.phraseid
+join players pl on pl.playerid = gp.playerid
+where lower(btrim(g.status)) in ('won', 'lost')
+group by pl.playerid, ph.difficulty_norm, pl.playername;
+
+commit;
@@ -0,0 +1,7 @@
+-- Keyset paging for the leaderboard: rows are ordered by
+-- (total_score desc, playername), so index exactly that.
+
+create index if not exists leaderboard_totals_page_idx
+    on leaderboard_totals (difficulty, total_score desc, playername);
+
+drop index if exists leaderboard_totals_rank_idx;
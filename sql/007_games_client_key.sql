@@ -0,0 +1,78 @@
+-- Idempotent game creation for replayed offline games.
+--
+-- The local store gives every game a client-generated key and sends it when
+-- it replays the game to Supabase. If a replay is retried after the game was
+-- already created (e.g. the client died before clearing its outbox), the
+-- existing game is returned instead of a duplicate being inserted.
+
+alter table games
+    add column if not exists client_key uuid;
+
+create unique index if not exists games_client_key_idx
+    on games (client_key);
+
+drop function if exists start_game_session(text, bigint, text, bigint);
+
+create or replace function start_game_session(
+    p_username text,
+    p_phraseid bigint,
+    p_bot_name text default 'Bot',
+    p_bot_playerid bigint default null,
+    p_client_key uuid default null
+)
+returns table (gameid bigint, playerid bigint, bot_playerid bigint, score integer)
+language plpgsql
+as $$
+declare
+    v_playerid bigint;
+    v_botid bigint := p_bot_playerid;
+    v_gameid bigint;
+    v_score integer := 0;
+begin
+    select p.playerid into v_playerid
+    from players p
+    where p.playername = p_username
+    limit 1;
+
+    if v_playerid is null then
+        insert into players (playername) values (p_username)
+        returning players.playerid into v_playerid;
+    end if;
+
+    if v_botid is null then
+        select p.playerid into v_botid
+        from players p
+        where p.playername = p_bot_name
+        limit 1;
+
+        if v_botid is null then
+            insert into players (playername) values (p_bot_name)
+            returning players.playerid into v_botid;
+        end if;
+    end if;
+
+    if p_client_key is not null then
+        insert into games (phraseid, client_key) values (p_phraseid, p_client_key)
+        on conflict (client_key) do nothing
+        returning games.gameid into v_gameid;
+
+        if v_gameid is null then
+            -- already created by an earlier attempt
+            select g.gameid into v_gameid from games g where g.client_key = p_client_key;
+            select gp.score into v_score
+            from gameplayers gp
+            where gp.gameid = v_gameid and gp.playerid = v_playerid;
+            return query select v_gameid, v_playerid, v_botid, coalesce(v_score, 0);
+            return;
+        end if;
+    else
+        insert into games (phraseid) values (p_phraseid)
+        returning games.gameid into v_gameid;
+    end if;
+
+    insert into gameplayers (gameid, playerid, score)
+    values (v_gameid, v_playerid, 0);
+
+    return query select v_gameid, v_playerid, v_botid, 0;
+end;
+$$;
@@ -0,0 +1,83 @@
+-- Reliable deltas for the client-side phrase cache.
+--
+-- updated_at was stamped with now(), i.e. transaction start, so a change that
+-- committed after a client's fetch could carry an older stamp than rows the
+-- client had already seen, and a strict "updated_at > newest seen" missed it.
+-- Deleted phrases were never reported at all.
+--
+-- Every insert and update now takes the next value of a sequence, and the
+-- client re-reads a small window below its cursor (see
+-- phrase_cache.SEQ_OVERLAP) to pick up changes that committed out of order.
+-- Deletes become soft deletes, so they travel through the same delta query
+-- and games referencing the phrase keep their foreign key.
+
+create sequence if not exists phrases_change_seq;
+
+alter table phrases
+    add column if not exists change_seq bigint not null default nextval('phrases_change_seq');
+
+alter table phrases
+    add column if not exists deleted boolean not null default false;
+
+create index if not exists phrases_change_seq_idx on phrases (change_seq);
+
+create or replace function phrases_touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := now();
+    new.change_seq := nextval('phrases_change_seq');
+    return new;
+end;
+$$;
+
+-- trigger from 002 stays in place and now also bumps change_seq
+
+create or replace function phrases_soft_delete()
+returns trigger
+language plpgsql
+as $$
+begin
+    update phrases set deleted = true where phraseid = old.phraseid;
+    return null;
+end;
+$$;
+
+drop trigger if exists phrases_soft_delete on phrases;
+create trigger phrases_soft_delete
+    before delete on phrases
+    for each row execute function phrases_soft_delete();
+
+-- deleted phrases are never picked
+create or replace function random_phrase(p_difficulty text, p_categories text[])
+returns table (phraseid bigint, phrasetext text, category text, difficulty text)
+language plpgsql
+volatile
+as $$
+declare
+    r double precision := random();
+begin
+    return query
+        select p.phraseid::bigint, p.phrasetext, p.category, p.difficulty
+        from phrases p
+        where p.difficulty_norm = lower(btrim(p_difficulty))
+          and p.category_norm = any (p_categories)
+          and not p.deleted
+          and p.rand_key >= r
+        order by p.rand_key
+        limit 1;
+
+    if not found then
+        -- wrap around to the start of the key range
+        return query
+            select p.phraseid::bigint, p.phrasetext, p.category, p.difficulty
+            from phrases p
+            where p.difficulty_norm = lower(btrim(p_difficulty))
+              and p.category_norm = any (p_categories)
+              and not p.deleted
+            order by p.rand_key
+            limit 1;
+    end if;
+end;
+$$;
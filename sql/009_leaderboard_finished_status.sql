@@ -0,0 +1,64 @@
+-- Count a game on the leaderboard when it is won or lost, not when its
+-- status merely stops being null.
+--
+-- 004's triggers assumed every unfinished game has status null. A game
+-- created with some other status ('playing', '', a column default) was never
+-- counted when it finished, and a status change between two non-null values
+-- (say 'playing' -> 'won') was skipped the same way. Finished now means
+-- 'won' or 'lost', and a game counts on its first move into that set.
+--
+-- Ends by rebuilding leaderboard_totals with the same rule, so games missed
+-- by the old trigger are picked up. 005 applies the same rule on later rebuilds.
+
+create or replace function game_finished(p_status text)
+returns boolean
+language sql
+immutable
+as $$
+    select coalesce(lower(btrim(p_status)) in ('won', 'lost'), false);
+$$;
+
+create or replace function leaderboard_totals_on_game()
+returns trigger
+language plpgsql
+as $$
+begin
+    if game_finished(new.status) and not game_finished(old.status) then
+        perform leaderboard_totals_add(gp.gameid, gp.playerid, gp.score, 1)
+        from gameplayers gp
+        where gp.gameid = new.gameid;
+    end if;
+    return new;
+end;
+$$;
+
+create or replace function leaderboard_totals_on_score()
+returns trigger
+language plpgsql
+as $$
+begin
+    if new.score is distinct from old.score
+       and exists (select 1 from games g where g.gameid = new.gameid and game_finished(g.status)) then
+        perform leaderboard_totals_add(new.gameid, new.playerid, new.score - old.score, 0);
+    end if;
+    return new;
+end;
+$$;
+
+-- backfill
+begin;
+
+lock table leaderboard_totals in exclusive mode;
+
+truncate leaderboard_totals;
+
+insert into leaderboard_totals (playerid, difficulty, playername, total_score, games_played)
+select pl.playerid, ph.difficulty_norm, pl.playername, sum(gp.score), count(*)
+from gameplayers gp
+join games g on g.gameid = gp.gameid
+join phrases ph on ph.phraseid = g.phraseid
+join players pl on pl.playerid = gp.playerid
+where game_finished(g.status)
+group by pl.playerid, ph.difficulty_norm, pl.playername;
+
+commit;
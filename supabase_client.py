@@ -1,13 +1,31 @@
 import os
 import random
-from supabase import create_client, Client
+import threading
+from concurrent.futures import Future
 from dotenv import load_dotenv
 
+from backend_base import BackendBase
+from leaderboard_cache import LEADERBOARD_PAGE_SIZE, LEADERBOARD_TTL, LeaderboardCache
+from local_store import LocalStore
+from phrase_cache import CACHE_PATH, PhraseCache
+from write_queue import WriteBehindQueue
+
 load_dotenv()
 
+# "function not found" from PostgREST's schema cache and from Postgres itself
+MISSING_FUNCTION_CODES = ("PGRST202", "42883")
+
+
+def _missing_function(error):
+    """True when an rpc() failed because the function isn't deployed."""
+    code = getattr(error, "code", None)
+    if code is None and error.args and isinstance(error.args[0], dict):
+        code = error.args[0].get("code")
+    return code in MISSING_FUNCTION_CODES
+
 
-class SupabaseClient:
-    def __init__(self):
+class SupabaseClient(BackendBase):
+    def __init__(self, cache_phrases=True):
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
 
@@ -17,7 +35,42 @@ class SupabaseClient:
                 f"SUPABASE_URL={url}, SUPABASE_KEY_SET={bool(key)}"
             )
 
-        self.client: Client = create_client(url, key)
+        self._url = url
+        self._key = key
+        self._future = None
+        self._connect_lock = threading.Lock()
+        self._bot_playerid = None
+
+        self._cache_phrases = cache_phrases
+        self.phrases = PhraseCache(self.fetch_phrases, path=CACHE_PATH if cache_phrases else None)
+        if cache_phrases:
+            self.phrases.load()
+
+    # connection
+    def connect(self):
+        """Start building the client on a background thread. Safe to call repeatedly."""
+        with self._connect_lock:
+            if self._future is None:
+                self._future = Future()
+                threading.Thread(target=self._build_client, name="supabase-connect", daemon=True).start()
+        return self._future
+
+    def _build_client(self):
+        try:
+            # imported here: the supabase package is slow to import
+            from supabase import create_client
+            client = create_client(self._url, self._key)
+        except Exception as e:
+            self._future.set_exception(e)
+            return
+
+        self._future.set_result(client)
+        if self._cache_phrases:
+            self.phrases.start_refresh()
+
+    @property
+    def client(self):
+        return self.connect().result()
 
     # player
     def get_or_create_player(self, username):
@@ -40,11 +93,55 @@ class SupabaseClient:
         return insert.data[0]["playerid"]
 
     # game
-    def start_game(self, phraseid, playerid):
+    def bootstrap_game(self, username, phraseid, client_key=None):
+        """Start a game. With a `client_key` (see sql/007) a retried call
+        returns the game the first call created."""
+        params = {
+            "p_username": username,
+            "p_phraseid": phraseid,
+            "p_bot_name": self.BOT_NAME,
+            "p_bot_playerid": self._bot_playerid,
+        }
+        if client_key is not None:
+            params["p_client_key"] = client_key
+
+        try:
+            result = self.client.rpc("start_game_session", params).execute()
+        except Exception as e:
+            # only a database without sql/003 takes the slow path: after a
+            # timeout the RPC may have committed, and redoing it without a
+            # client_key would start a second game
+            if not _missing_function(e):
+                raise
+        else:
+            row = result.data[0] if isinstance(result.data, list) else result.data
+            self._bot_playerid = row["bot_playerid"]
+            return row["gameid"], row["playerid"], row["bot_playerid"], row.get("score") or 0
+
+        playerid = self.get_or_create_player(username)
+        bot_playerid = self.get_bot_playerid()
+        gameid = self.start_game(phraseid, playerid, client_key)
+        return gameid, playerid, bot_playerid, 0
+
+    def start_game(self, phraseid, playerid, client_key=None):
+        if client_key is not None:
+            existing = (
+                self.client
+                .from_("games")
+                .select("gameid")
+                .eq("client_key", client_key)
+                .execute()
+            )
+            if existing.data:
+                return existing.data[0]["gameid"]
+
+        values = {"phraseid": phraseid}
+        if client_key is not None:
+            values["client_key"] = client_key
         game = (
             self.client
             .from_("games")
-            .insert({"phraseid": phraseid})
+            .insert(values)
             .execute()
         )
         gameid = game.data[0]["gameid"]
@@ -61,29 +158,70 @@ class SupabaseClient:
         return self.client.from_(table).update(values).match(match).execute()
 
     # phrase
-    def get_random_phrase(self, difficulty="medium"):
-        allowed = {"cowboy", "cowboys", "pixar", "social"}
+    def get_random_phrase(self, difficulty="medium", exclude=("music",)):
+        difficulty = (difficulty or "medium").strip().lower()
+        categories = self._categories(exclude)
 
-        result = (
-            self.client
-            .from_("phrases")
-            .select("phraseid, phrasetext, category, difficulty")
-            .execute()
-        )
+        cached = self.phrases.pick(difficulty, categories)
+        if cached:
+            return cached["phraseid"], cached["phrasetext"], cached.get("category", "")
 
-        rows = result.data or []
-        rows = [
-            r for r in rows
-            if (r.get("difficulty") or "").strip().lower() == difficulty.lower()
-            and (r.get("category") or "").strip().lower() in allowed
-        ]
+        try:
+            result = self.client.rpc("random_phrase", {
+                "p_difficulty": difficulty,
+                "p_categories": categories,
+            }).execute()
+            rows = result.data or []
+        except Exception:
+            rows = self._random_phrase_by_key(difficulty, categories)
 
         if rows:
-            choice = random.choice(rows)
+            choice = rows[0]
             return choice["phraseid"], choice["phrasetext"], choice.get("category", "")
 
         return None, None, None
 
+    def _random_phrase_by_key(self, difficulty, categories):
+        # ranged pick on the precomputed rand_key, wrapping around once
+        r = random.random()
+
+        def query(gte):
+            q = (
+                self.client
+                .from_("phrases")
+                .select("phraseid, phrasetext, category, difficulty")
+                .eq("difficulty_norm", difficulty)
+                .in_("category_norm", categories)
+                .eq("deleted", False)
+            )
+            if gte:
+                q = q.gte("rand_key", r)
+            return q.order("rand_key").limit(1).execute().data or []
+
+        return query(True) or query(False)
+
+    def fetch_phrases(self, since=None, page_size=1000):
+        rows = []
+        while True:
+            query = (
+                self.client
+                .from_("phrases")
+                .select("phraseid, phrasetext, category, difficulty, change_seq, deleted")
+            )
+            if since is not None:
+                query = query.gt("change_seq", since)
+            page = (
+                query
+                .order("change_seq")
+                .order("phraseid")
+                .range(len(rows), len(rows) + page_size - 1)
+                .execute()
+                .data or []
+            )
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+
     # guesses
     def record_guess(self, gameid, playerid, letter, correct):
         data = {
@@ -94,6 +232,11 @@ class SupabaseClient:
         }
         return self.client.from_("guesses").insert(data).execute()
 
+    def record_guesses(self, rows):
+        if not rows:
+            return None
+        return self.client.from_("guesses").insert(rows).execute()
+
     def get_score(self, gameid, playerid):
         result = (
             self.client
@@ -107,27 +250,89 @@ class SupabaseClient:
             return result.data[0]["score"]
         return 0
 
-    def increment_score(self, gameid, playerid):
+    def increment_score(self, gameid, playerid, raise_errors=False):
+        """Add a point. Failures are swallowed (reconcile_score at the finish
+        corrects the total) unless `raise_errors`, which an outbox replay
+        needs so the row is kept and retried."""
         try:
             return self.client.rpc("increment_score", {
                 "p_gameid": gameid,
                 "p_playerid": playerid
             }).execute()
         except Exception:
+            if raise_errors:
+                raise
             return None
 
+    def request_sync(self, then=None):
+        # writes go straight to Supabase, so there is nothing to wait for
+        if then is not None:
+            then()
+
     # leaderboard
-    def get_leaderboard(self, difficulty):
-        result = (
-            self.client
-            .from_("leaderboard")
-            .select("*")
-            .eq("difficulty", difficulty)
-            .order("total_score", desc=True)
-            .limit(10)
-            .execute()
-        )
-        return result.data
+    def get_leaderboard(self, difficulty, limit=10, after=None):
+        """Rows ranked by total_score, then playername.
+
+        `after` is the (total_score, playername) of the last row already shown,
+        for keyset paging.
+        """
+        difficulty = (difficulty or "").strip().lower()
+
+        def query(table, columns):
+            q = (
+                self.client
+                .from_(table)
+                .select(columns)
+                .eq("difficulty", difficulty)
+            )
+            if after is not None:
+                score, name = after
+                name = str(name).replace("\\", "\\\\").replace('"', '\\"')
+                q = q.or_(f'total_score.lt.{score},and(total_score.eq.{score},playername.gt."{name}")')
+            return (
+                q.order("total_score", desc=True)
+                .order("playername")
+                .limit(limit)
+                .execute()
+                .data
+            )
+
+        try:
+            # a keyset range scan of leaderboard_totals_page_idx
+            # (difficulty, total_score desc, playername; see sql/006)
+            return query("leaderboard_totals", "playername, difficulty, total_score, games_played")
+        except Exception:
+            return query("leaderboard", "*")
+
+
+def _make_backend():
+    # "local" (default): SQLite first, synced to Supabase when reachable
+    # "supabase": talk to Supabase directly
+    mode = os.getenv("HANGVERSUS_STORAGE", "local").strip().lower()
+
+    try:
+        remote = SupabaseClient(cache_phrases=(mode == "supabase"))
+    except Exception:
+        remote = None
+
+    if mode == "supabase" and remote is not None:
+        return remote
+
+    return LocalStore(remote=remote)
+
+
+def _env_seconds(name, default):
+    # a bad value falls back to the default instead of failing the import
+    try:
+        value = float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if 0 <= value < float("inf") else default
 
 
-db = SupabaseClient()
+db = _make_backend()
+writes = WriteBehindQueue(db)
+leaderboards = LeaderboardCache(
+    lambda difficulty: db.get_leaderboard(difficulty, LEADERBOARD_PAGE_SIZE),
+    ttl=_env_seconds("HANGVERSUS_LEADERBOARD_TTL", LEADERBOARD_TTL),
+)
@@ -0,0 +1,42 @@
+import random
+
+from bot_player import BotPlayer, CandidateBot, PhraseIndex
+from letter_mask import BIT, mask_of
+
+
+def _texts(index, length, mask):
+    return {p for i, p in enumerate(index.phrases[length]) if mask >> i & 1}
+
+
+def test_blank_positions_must_hold_letters():
+    index = PhraseIndex(["ABCDE", "AB DE", "XYZZY"])
+    assert _texts(index, 5, index.candidates("ABCDE", 0, 0)) == {"ABCDE", "XYZZY"}
+
+
+def test_candidates_follow_hits_and_misses():
+    index = PhraseIndex(["HIGH NOON", "HIGH NOTE", "SADDLE UP", "WILD WEST"])
+    word = "HIGH NOON"
+
+    assert _texts(index, 9, index.candidates(word, 0, 0)) == {"HIGH NOON", "HIGH NOTE", "WILD WEST"}
+    assert _texts(index, 9, index.candidates(word, BIT["H"], 0)) == {"HIGH NOON", "HIGH NOTE"}
+    # O shows at both positions, so HIGH NOTE (one O) is out
+    assert _texts(index, 9, index.candidates(word, BIT["O"], BIT["E"])) == {"HIGH NOON"}
+
+
+def test_candidate_bot_pins_the_phrase():
+    index = PhraseIndex(["HIGH NOON", "HIGH NOTE", "WILD WEST"])
+    bot = CandidateBot("hard+", "HIGH NOON", index, rng=random.Random(1))
+    guessed = 0
+    for _ in range(5):
+        if bot.known_phrase(guessed):
+            break
+        guessed |= BIT[bot.make_guess(guessed)]
+    assert bot.known_phrase(guessed) == "HIGH NOON"
+
+
+def test_bot_never_repeats_a_letter():
+    bot = BotPlayer("medium", rng=random.Random(3))
+    seen = [bot.make_guess() for _ in range(26)]
+    assert sorted(seen) == sorted("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    assert bot.make_guess() is None
+    assert bot.mask == mask_of(seen)
@@ -0,0 +1,152 @@
+import random
+
+from game_engine import (
+    BONUS, CALLED, GAME_OVER, HANGED, INVALID, MAX_PARTS, REPEAT, SOLVED, TURN, GameEngine,
+)
+
+
+class FixedRandom(random.Random):
+    """random() always returns `value`: 0.99 makes the bot miss and never
+    call the phrase, 0.0 makes it hit and call as soon as it may."""
+
+    def __init__(self, value):
+        super().__init__(0)
+        self.value = value
+
+    def random(self):
+        return self.value
+
+
+class Storage:
+    def __init__(self):
+        self.calls = []
+
+    def record_guess(self, who, letter, correct):
+        self.calls.append(("guess", who, letter, correct))
+
+    def add_score(self):
+        self.calls.append(("score",))
+
+    def finish(self, status, score):
+        self.calls.append(("finish", status, score))
+
+
+def _kinds(events):
+    return [kind for kind, _, _ in events]
+
+
+def test_player_solves_by_letters():
+    storage = Storage()
+    engine = GameEngine("ABBA", rng=FixedRandom(0.99), storage=storage)
+    engine.guess_letter("a")
+    events = engine.guess_letter("B")
+
+    s = engine.state
+    assert (s.over, s.winner, s.ending, s.score) == (True, "player", SOLVED, 2)
+    assert events[-1] == (GAME_OVER, "player", SOLVED)
+    assert storage.calls[-1] == ("finish", "won", 2)
+
+
+def test_player_calls_the_phrase():
+    engine = GameEngine("HIGH NOON", rng=FixedRandom(0.99))
+    events = engine.guess_phrase(" high noon ")
+    assert events[-1] == (GAME_OVER, "player", CALLED)
+    assert engine.state.guessed == engine.state.letters
+
+
+def test_wrong_phrase_costs_two_parts_and_the_player_can_hang():
+    engine = GameEngine("HIGH NOON", rng=FixedRandom(0.99))
+    engine.guess_phrase("WILD WEST")
+    assert engine.state.wrong == 2
+    engine.state.turn = "player"
+    engine.state.wrong = MAX_PARTS - 1
+    events = engine.guess_phrase("SADDLE UP")
+
+    s = engine.state
+    assert s.wrong == MAX_PARTS
+    assert (s.over, s.winner, s.ending) == (True, "bot", HANGED)
+    assert events[-1] == (GAME_OVER, "bot", HANGED)
+
+
+def test_repeat_and_invalid_change_nothing():
+    engine = GameEngine("ABBA", rng=FixedRandom(0.99))
+    engine.guess_letter("A")
+    before = (engine.state.guessed, engine.state.tried, engine.state.score)
+
+    assert engine.guess_letter("a") == [(REPEAT, "player", "A")]
+    assert engine.guess_letter("7") == [(INVALID, "player", "7")]
+    assert (engine.state.guessed, engine.state.tried, engine.state.score) == before
+
+
+def test_two_misses_pass_the_turn():
+    engine = GameEngine("ABBA", rng=FixedRandom(0.99))
+    engine.guess_letter("X")
+    assert engine.state.turn == "player"
+    events = engine.guess_letter("Y")
+    assert events[-1] == (TURN, "bot", None)
+    assert engine.guess_letter("Z") == []
+
+
+def test_bonus_take_and_add():
+    engine = GameEngine("ABCD", rng=FixedRandom(0.99))
+    engine.guess_letter("X")
+    engine.guess_letter("A")
+    events = engine.guess_letter("B")
+    assert BONUS in _kinds(events)
+    assert engine.guess_letter("C") == []  # waits on the bonus choice
+    engine.choose_bonus("take")
+    assert engine.state.wrong == 0
+
+    engine.new_game("ABCD")
+    engine.state.bot_wrong = MAX_PARTS - 1
+    engine.guess_letter("A")
+    engine.guess_letter("B")
+    events = engine.choose_bonus("add")
+
+    s = engine.state
+    assert (s.over, s.winner, s.ending) == (True, "player", HANGED)
+    assert events[-1] == (GAME_OVER, "player", HANGED)
+
+
+def test_bot_hangs_on_misses():
+    engine = GameEngine("AB", "easy", rng=FixedRandom(0.99))
+    s = engine.state
+    s.turn = "bot"
+    s.bot_wrong = MAX_PARTS - 1
+    events = engine.bot_step()
+    assert s.bot_wrong == MAX_PARTS
+    assert events[-1] == (GAME_OVER, "player", HANGED)
+
+
+def test_bot_calls_the_phrase():
+    engine = GameEngine("ABBA", "hard", rng=FixedRandom(0.0))
+    s = engine.state
+    s.turn = "bot"
+    while not s.over:
+        engine.bot_step()
+    assert (s.winner, s.ending) == ("bot", CALLED)
+
+
+def test_seeded_games_repeat_and_new_game_resets():
+    def play(engine):
+        s = engine.state
+        letters = iter("ETAOINSHRDLUCMFWYPVBGKJQXZ")
+        while not s.over:
+            if s.turn == "bot":
+                engine.bot_step()
+            elif s.pending_bonus:
+                engine.choose_bonus("take")
+            else:
+                engine.guess_letter(next(letters))
+        return s.winner, s.ending, s.guessed, s.bot_guessed, s.wrong, s.bot_wrong
+
+    engine = GameEngine("SADDLE UP", "medium", rng=random.Random(7))
+    first = play(engine)
+    assert play(GameEngine("SADDLE UP", "medium", rng=random.Random(7))) == first
+
+    engine.new_game("WILD WEST", score=3)
+    s = engine.state
+    assert (s.word, s.score, s.over, s.turn, s.guessed, s.tried, s.wrong, s.bot_wrong) == (
+        "WILD WEST", 3, False, "player", 0, 0, 0, 0,
+    )
+    assert engine.bot.mask == 0
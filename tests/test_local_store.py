@@ -0,0 +1,192 @@
+import json
+import threading
+
+from local_store import MAX_SYNC_ATTEMPTS, LocalStore
+
+
+class FakeRemote:
+    """Just enough of SupabaseClient for LocalStore.sync."""
+
+    def __init__(self):
+        self.players = {}
+        self.games = {}
+        self.guesses = []
+        self.updates = []
+        self.scores = {}
+        self.fail = set()
+
+    def fetch_phrases(self, since=None):
+        return []
+
+    def get_random_phrase(self, difficulty="medium", exclude=("music",)):
+        if "phrase" in self.fail:
+            raise RuntimeError("remote down")
+        return 7, "WILD WEST", "cowboy"
+
+    def get_or_create_player(self, name):
+        return self.players.setdefault(name, 100 + len(self.players))
+
+    def bootstrap_game(self, username, phraseid, client_key=None):
+        if "start_game" in self.fail:
+            raise RuntimeError("remote down")
+        for gameid, game in self.games.items():
+            if client_key is not None and game["key"] == client_key:
+                return gameid, self.get_or_create_player(username), self.get_or_create_player("Bot"), 0
+        gameid = 500 + len(self.games)
+        self.games[gameid] = {"phraseid": phraseid, "key": client_key, "status": None}
+        return gameid, self.get_or_create_player(username), self.get_or_create_player("Bot"), 0
+
+    def record_guesses(self, rows):
+        if "guesses" in self.fail:
+            raise RuntimeError("constraint violation")
+        self.guesses.extend(rows)
+
+    def update(self, table, values, match):
+        self.updates.append((table, values, match))
+        if table == "games":
+            self.games[match["gameid"]].update(values)
+
+    def increment_score(self, gameid, playerid, raise_errors=False):
+        if "increment_score" in self.fail:
+            if raise_errors:
+                raise RuntimeError("remote down")
+            return None
+        self.scores[gameid] = self.scores.get(gameid, 0) + 1
+
+    def get_leaderboard(self, difficulty, limit=10, after=None):
+        raise RuntimeError("offline")
+
+
+def _store(remote=None):
+    store = LocalStore(":memory:", remote=remote)
+    store.phrases.add_rows([])
+    store._execute("insert into phrases (phraseid, phrasetext, category, difficulty) values (1, 'HIGH NOON', 'pixar', 'Hard')")
+    return store
+
+
+def test_sync_maps_local_ids_to_remote():
+    remote = FakeRemote()
+    store = _store(remote)
+    gameid, playerid, _, _ = store.bootstrap_game("ann", 1)
+    store.record_guess(gameid, playerid, "H", True)
+    store.update("games", {"status": "won"}, {"gameid": gameid})
+
+    assert store.sync() == 3
+    (remote_gameid, game), = remote.games.items()
+    assert game["status"] == "won"
+    assert remote.guesses[0]["gameid"] == remote_gameid
+    assert remote.guesses[0]["playerid"] == remote.players["ann"]
+    assert store._query("select count(*) as n from outbox")[0]["n"] == 0
+
+
+def test_request_sync_runs_callback_after_the_push():
+    remote = FakeRemote()
+    store = _store(remote)
+    gameid, _, _, _ = store.bootstrap_game("ann", 1)
+    store.start_sync()
+    try:
+        store.update("games", {"status": "won"}, {"gameid": gameid})
+        seen = threading.Event()
+        statuses = []
+        store.request_sync(lambda: (statuses.append([g["status"] for g in remote.games.values()]), seen.set()))
+        assert seen.wait(5)
+        assert statuses == [["won"]]
+    finally:
+        store.stop()
+
+
+def test_local_board_counts_finished_games_only():
+    store = _store()
+    done, ann, _, _ = store.bootstrap_game("ann", 1)
+    store.increment_score(done, ann)
+    store.update("games", {"status": "won"}, {"gameid": done})
+    unfinished, bob, _, _ = store.bootstrap_game("bob", 1)
+    store.increment_score(unfinished, bob)
+
+    board = store.get_leaderboard("hard")
+    assert [(r["playername"], r["total_score"]) for r in board] == [("ann", 1)]
+
+
+def test_failing_row_is_parked_and_later_rows_sync():
+    remote = FakeRemote()
+    store = _store(remote)
+    gameid, playerid, _, _ = store.bootstrap_game("ann", 1)
+    store.record_guess(gameid, playerid, "H", True)
+    store.update("games", {"status": "won"}, {"gameid": gameid})
+
+    remote.fail.add("guesses")
+    for _ in range(MAX_SYNC_ATTEMPTS - 1):
+        store.sync()
+        assert list(remote.games.values())[0]["status"] is None
+    store.sync()
+
+    assert list(remote.games.values())[0]["status"] == "won"
+    parked = store._query("select kind, attempts, last_error from outbox where parked = 1")
+    assert [(r["kind"], r["attempts"]) for r in parked] == [("guesses", MAX_SYNC_ATTEMPTS)]
+    assert "constraint violation" in parked[0]["last_error"]
+
+
+def test_unreachable_remote_does_not_count_attempts():
+    remote = FakeRemote()
+    remote.fetch_phrases = lambda since=None: (_ for _ in ()).throw(OSError("offline"))
+    store = _store(remote)
+    store.bootstrap_game("ann", 1)
+    for _ in range(MAX_SYNC_ATTEMPTS + 1):
+        assert store.sync() == 0
+    assert store._query("select attempts, parked from outbox") == [{"attempts": 0, "parked": 0}]
+
+
+def test_start_game_replay_is_idempotent():
+    remote = FakeRemote()
+    store = _store(remote)
+    store.bootstrap_game("ann", 1)
+    entry = store._query("select kind, payload from outbox")[0]
+
+    # a crash after the remote insert but before the outbox delete
+    store._replay(entry["kind"], json.loads(entry["payload"]))
+    store.sync()
+
+    assert len(remote.games) == 1
+
+
+def test_failed_increment_stays_in_the_outbox():
+    remote = FakeRemote()
+    store = _store(remote)
+    gameid, playerid, _, _ = store.bootstrap_game("ann", 1)
+    store.increment_score(gameid, playerid)
+
+    remote.fail.add("increment_score")
+    assert store.sync() == 1
+    assert [r["kind"] for r in store._query("select kind from outbox")] == ["increment_score"]
+
+    remote.fail.clear()
+    assert store.sync() == 1
+    assert list(remote.scores.values()) == [1]
+
+
+def test_empty_store_falls_back_to_the_remote_phrase():
+    remote = FakeRemote()
+    store = LocalStore(":memory:", remote=remote)
+    assert store.get_random_phrase("hard") == (7, "WILD WEST", "cowboy")
+
+    gameid, playerid, _, _ = store.bootstrap_game("ann", 7)
+    store.increment_score(gameid, playerid)
+    store.update("games", {"status": "won"}, {"gameid": gameid})
+    assert [(r["playername"], r["total_score"]) for r in store.get_leaderboard("hard")] == [("ann", 1)]
+
+
+def test_game_without_a_phrase_stays_local():
+    remote = FakeRemote()
+    remote.fail.add("phrase")
+    store = LocalStore(":memory:", remote=remote)
+    assert store.get_random_phrase("hard") == (None, None, None)
+
+    gameid, playerid, _, _ = store.bootstrap_game("ann", None)
+    store.record_guess(gameid, playerid, "P", True)
+    store.increment_score(gameid, playerid)
+    store.update("games", {"status": "won"}, {"gameid": gameid})
+
+    store.sync()
+    assert remote.games == {}
+    assert remote.guesses == [] and remote.updates == []
+    assert store._query("select count(*) as n from outbox")[0]["n"] == 0
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import bot_player
+from phrase_cache import SEQ_OVERLAP, PhraseCache
+
+
+def _row(phraseid, text, seq, deleted=False):
+    return {
+        "phraseid": phraseid,
+        "phrasetext": text,
+        "category": "pixar",
+        "difficulty": "hard",
+        "change_seq": seq,
+        "deleted": deleted,
+    }
+
+
+class FakeTable:
+    def __init__(self, rows):
+        self.rows = rows
+        self.asked = []
+
+    def fetch(self, since):
+        self.asked.append(since)
+        return [r for r in self.rows if since is None or r["change_seq"] > since]
+
+
+def test_deleted_phrases_leave_the_cache():
+    table = FakeTable([_row(1, "HIGH NOON", 1), _row(2, "WILD WEST", 2)])
+    cache = PhraseCache(table.fetch, path=None)
+    cache.refresh()
+    assert len(cache) == 2
+
+    table.rows[0] = _row(1, "HIGH NOON", 3, deleted=True)
+    cache.refresh()
+    assert len(cache) == 1
+    assert cache.pick("hard", ["pixar"])["phraseid"] == 2
+
+
+def test_refresh_rereads_below_the_cursor():
+    table = FakeTable([_row(1, "HIGH NOON", SEQ_OVERLAP + 50)])
+    cache = PhraseCache(table.fetch, path=None)
+    cache.refresh()
+
+    # numbered before the cursor but committed after the last fetch
+    table.rows.append(_row(2, "WILD WEST", 60))
+    cache.refresh()
+
+    assert table.asked == [None, 50]
+    assert len(cache) == 2
+
+
+def test_full_fetch_drops_phrases_the_table_no_longer_has():
+    cache = PhraseCache(FakeTable([_row(2, "WILD WEST", 2)]).fetch, path=None)
+    cache.add_rows([{**_row(1, "HIGH NOON", None)}])
+    cache.cursor = None
+    cache.refresh()
+    assert [r["phraseid"] for r in [cache.pick("hard", ["pixar"])]] == [2]
+    assert len(cache) == 1
+
+
+def test_unchanged_rereads_leave_the_cache_alone():
+    table = FakeTable([_row(1, "HIGH NOON", 5), _row(2, "WILD WEST", 6)])
+    cache = PhraseCache(table.fetch, path=None)
+    assert cache.refresh()
+    generation = cache._generation
+
+    for _ in range(3):
+        assert not cache.refresh()
+    assert cache._generation == generation
+
+    table.rows[1] = _row(2, "WILD WEST", 7, deleted=True)
+    assert cache.refresh()
+    assert cache._generation == generation + 1
+
+
+def test_failed_index_build_is_not_respawned(monkeypatch):
+    attempts = []
+
+    def broken(texts):
+        attempts.append(threading.current_thread().name)
+        raise MemoryError
+
+    monkeypatch.setattr(bot_player, "PhraseIndex", broken)
+    cache = PhraseCache(FakeTable([_row(1, "HIGH NOON", 1)]).fetch, path=None)
+    cache.refresh()
+
+    assert cache.phrase_index("hard", ["pixar"]) is None
+    time.sleep(0.2)
+    assert len(attempts) == 1
+    assert not cache._building
@@ -0,0 +1,71 @@
+from write_queue import WriteBehindQueue
+
+
+class Backend:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.calls = []
+
+    def record_guesses(self, rows):
+        self.calls.append(("guesses", len(rows)))
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("remote down")
+
+    def update(self, table, values, match):
+        self.calls.append(("update", table, values, match))
+
+
+def test_batches_guesses_and_merges_updates():
+    backend = Backend()
+    q = WriteBehindQueue(backend, linger=0)
+    q.record_guess(1, 2, "A", True)
+    q.record_guess(1, 2, "B", False)
+    q.update("games", {"status": "won"}, {"gameid": 1})
+    q.update("games", {"score": 3}, {"gameid": 1})
+    assert q.flush(wait=True, timeout=2)
+    q.close()
+
+    assert backend.calls == [("guesses", 2), ("update", "games", {"status": "won", "score": 3}, {"gameid": 1})]
+
+
+def test_failed_writes_are_retried_then_counted(caplog):
+    backend = Backend(failures=2)
+    q = WriteBehindQueue(backend, linger=0, retries=2, backoff=0)
+    q.record_guess(1, 2, "A", True)
+    assert q.flush(wait=True, timeout=2)
+    assert backend.calls == [("guesses", 1)] * 3
+    assert q.failed == 0
+
+    backend.failures = 5
+    q.record_guess(1, 2, "B", True)
+    q.update("games", {"status": "lost"}, {"gameid": 1})
+    assert q.flush(wait=True, timeout=2)
+    q.close()
+
+    assert q.failed == 1
+    assert "record_guesses failed after 3 attempts" in caplog.text
+    # the update behind the failed batch still goes out
+    assert backend.calls[-1][0] == "update"
+
+
+def test_close_waits_out_a_retrying_write(caplog):
+    backend = Backend(failures=3)
+    q = WriteBehindQueue(backend, linger=0, retries=3, backoff=0.05)
+    q.record_guess(1, 2, "A", True)
+    q.update("games", {"status": "won"}, {"gameid": 1})
+    q.close()
+
+    # 0.05 + 0.1 + 0.2s of backoff fits the default timeout
+    assert backend.calls[-1][0] == "update"
+    assert "not applied" not in caplog.text
+
+
+def test_close_logs_writes_it_gave_up_on(caplog):
+    backend = Backend(failures=3)
+    q = WriteBehindQueue(backend, linger=0, retries=3, backoff=0.2)
+    q.record_guess(1, 2, "A", True)
+    q.update("games", {"status": "won"}, {"gameid": 1})
+    q.close(timeout=0.1)
+
+    assert "with 2 writes not applied" in caplog.text
@@ -0,0 +1,157 @@
+import logging
+import queue
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteBehindQueue:
+    """Applies guess and game-status writes on a worker thread.
+
+    Writes are applied in submission order. Consecutive guesses are sent as a
+    single batch insert and consecutive updates of the same row are merged.
+    A write that raises is retried `retries` times, `backoff` seconds apart
+    and doubling; after that it is logged and dropped, and `failed` counts it.
+    """
+
+    def __init__(self, backend, linger=0.25, batch_size=50, retries=3, backoff=0.5):
+        self.backend = backend
+        self.linger = linger
+        self.batch_size = batch_size
+        self.retries = retries
+        self.backoff = backoff
+        self.failed = 0
+        self._in_flight = 0
+
+        self._q = queue.Queue()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    # producers
+    def record_guess(self, gameid, playerid, letter, correct):
+        self._put(("guess", {
+            "gameid": gameid,
+            "playerid": playerid,
+            "guessedletter": letter,
+            "correct": correct,
+        }))
+
+    def update(self, table, values, match):
+        self._put(("update", (table, dict(values), dict(match))))
+
+    def call(self, fn, *args, **kwargs):
+        self._put(("call", (fn, args, kwargs)))
+
+    def _put(self, op):
+        if self._closed:
+            return
+        self._q.put(op)
+
+    def flush(self, wait=False, timeout=None):
+        done = threading.Event()
+        self._q.put(("marker", done))
+        self._wake.set()
+        if wait:
+            return done.wait(timeout)
+        return True
+
+    def close(self, timeout=None):
+        """Stop taking writes and wait for the queued ones. `timeout`
+        defaults to one write's full retry budget, plus a second."""
+        if self._closed:
+            return
+        if timeout is None:
+            timeout = self.linger + self.backoff * (2 ** self.retries - 1) + 1.0
+        self.flush()
+        self._closed = True
+        self._q.put(_STOP)
+        self._wake.set()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            with self._q.mutex:
+                queued = sum(1 for op in self._q.queue if op is not _STOP and op[0] != "marker")
+            log.warning("closed after %.1fs with %d writes not applied", timeout, queued + self._in_flight)
+
+    # worker
+    def _drain(self, first):
+        ops = [first]
+        while len(ops) < self.batch_size:
+            try:
+                ops.append(self._q.get_nowait())
+            except queue.Empty:
+                break
+        return ops
+
+    def _run(self):
+        while True:
+            first = self._q.get()
+            if first is not _STOP and first[0] != "marker":
+                self._wake.wait(self.linger)
+            self._wake.clear()
+
+            ops = self._drain(first)
+            stop = _STOP in ops
+            ops = [op for op in ops if op is not _STOP]
+            self._in_flight = sum(1 for kind, _ in ops if kind != "marker")
+            self._apply(ops)
+            self._in_flight = 0
+            if stop:
+                return
+
+    def _apply(self, ops):
+        guesses = []
+        pending_update = None
+
+        def send_guesses():
+            if guesses:
+                self._safe(self.backend.record_guesses, list(guesses))
+                guesses.clear()
+
+        def send_update():
+            nonlocal pending_update
+            if pending_update:
+                self._safe(self.backend.update, *pending_update)
+                pending_update = None
+
+        for kind, payload in ops:
+            if kind != "guess":
+                send_guesses()
+            if kind != "update":
+                send_update()
+
+            if kind == "guess":
+                guesses.append(payload)
+            elif kind == "update":
+                table, values, match = payload
+                if pending_update and pending_update[0] == table and pending_update[2] == match:
+                    pending_update[1].update(values)
+                else:
+                    send_update()
+                    pending_update = (table, values, match)
+            elif kind == "call":
+                fn, args, kwargs = payload
+                self._safe(fn, *args, **kwargs)
+            elif kind == "marker":
+                payload.set()
+
+        send_guesses()
+        send_update()
+
+    def _safe(self, fn, *args, **kwargs):
+        delay = self.backoff
+        for attempt in range(self.retries + 1):
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                if attempt == self.retries:
+                    self.failed += 1
+                    log.exception("write %s failed after %d attempts", getattr(fn, "__name__", fn), attempt + 1)
+                    return None
+                # later writes wait behind this one, which keeps the order
+                time.sleep(delay)
+                delay *= 2